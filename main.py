@@ -2,58 +2,84 @@
 
 from __future__ import annotations
 
+import logging
+
 import hydra
 from omegaconf import DictConfig, OmegaConf
 
-from md_agent.agent import MDAgent
+log = logging.getLogger(__name__)
+
+# Prompt templates keyed by mode (reproduce_paper is keyed by paper source).
+_TEMPLATES: dict[str, str] = {
+    "run": (
+        "Run a {target_name} simulation for the {system_name} system. "
+        "Use all parameters defined in the loaded Hydra config. "
+        "Work directory: {work_dir}. "
+        "Initialize wandb, generate all input files, run grompp, "
+        "launch mdrun with the PLUMED input, start the background monitor, "
+        "wait for completion, then do a final wandb log and analysis."
+    ),
+    "paper.text": (
+        "Extract MD simulation parameters from the following paper text and "
+        "reproduce the simulation. Work directory: {work_dir}.\n\n"
+        "Paper text:\n{text}"
+    ),
+    "paper.arxiv_id": (
+        "Find ArXiv paper {arxiv_id}, extract its MD simulation "
+        "parameters, generate a Hydra config, and reproduce the simulation. "
+        "Work directory: {work_dir}. "
+        "Always show me the extracted config and ask for confirmation before running."
+    ),
+    "paper.query": (
+        "Search for papers about: '{query}'. "
+        "Show me the top results, let me choose one, then extract its MD "
+        "simulation parameters and reproduce them. Work directory: {work_dir}. "
+        "Ask for confirmation before running the simulation."
+    ),
+    "paper.pdf_path": (
+        "Extract MD simulation parameters from the PDF at {pdf_path}, "
+        "generate a Hydra config, and reproduce the simulation. "
+        "Work directory: {work_dir}. "
+        "Show me the extracted config and ask for confirmation before running."
+    ),
+}
 
 
 @hydra.main(version_base=None, config_path="conf", config_name="config")
 def main(cfg: DictConfig) -> None:
+    # Deferred: md_agent.agent pulls in anthropic, wandb and langchain, which
+    # `python main.py --help` / `--cfg job` never need.
+    from md_agent.agent import MDAgent
+
+    # Resolve interpolations once so the agent's repeated reads are plain lookups.
+    OmegaConf.resolve(cfg)
     work_dir = cfg.run.work_dir
+    # to_yaml walks every node — only pay for it when it is emitted.
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Resolved config:\n%s", OmegaConf.to_yaml(cfg))
     agent = MDAgent(cfg=cfg, work_dir=work_dir)
 
     if cfg.mode == "run":
-        target_name = OmegaConf.select(cfg, "method._target_name", default="enhanced sampling")
-        system_name = OmegaConf.select(cfg, "system.name", default="system")
-        prompt = (
-            f"Run a {target_name} simulation for the {system_name} system. "
-            f"Use all parameters defined in the loaded Hydra config. "
-            f"Work directory: {work_dir}. "
-            f"Initialize wandb, generate all input files, run grompp, "
-            f"launch mdrun with the PLUMED input, start the background monitor, "
-            f"wait for completion, then do a final wandb log and analysis."
+        prompt = _TEMPLATES["run"].format(
+            target_name=OmegaConf.select(cfg, "method._target_name", default="enhanced sampling"),
+            system_name=OmegaConf.select(cfg, "system.name", default="system"),
+            work_dir=work_dir,
         )
         result = agent.run(prompt)
         print(result)
 
     elif cfg.mode == "reproduce_paper":
         if cfg.paper.text:
-            prompt = (
-                f"Extract MD simulation parameters from the following paper text and "
-                f"reproduce the simulation. Work directory: {work_dir}.\n\n"
-                f"Paper text:\n{cfg.paper.text}"
-            )
+            prompt = _TEMPLATES["paper.text"].format(text=cfg.paper.text, work_dir=work_dir)
         elif cfg.paper.arxiv_id:
-            prompt = (
-                f"Find ArXiv paper {cfg.paper.arxiv_id}, extract its MD simulation "
-                f"parameters, generate a Hydra config, and reproduce the simulation. "
-                f"Work directory: {work_dir}. "
-                f"Always show me the extracted config and ask for confirmation before running."
+            prompt = _TEMPLATES["paper.arxiv_id"].format(
+                arxiv_id=cfg.paper.arxiv_id, work_dir=work_dir
             )
         elif cfg.paper.query:
-            prompt = (
-                f"Search for papers about: '{cfg.paper.query}'. "
-                f"Show me the top results, let me choose one, then extract its MD "
-                f"simulation parameters and reproduce them. Work directory: {work_dir}. "
-                f"Ask for confirmation before running the simulation."
-            )
+            prompt = _TEMPLATES["paper.query"].format(query=cfg.paper.query, work_dir=work_dir)
         elif cfg.paper.pdf_path:
-            prompt = (
-                f"Extract MD simulation parameters from the PDF at {cfg.paper.pdf_path}, "
-                f"generate a Hydra config, and reproduce the simulation. "
-                f"Work directory: {work_dir}. "
-                f"Show me the extracted config and ask for confirmation before running."
+            prompt = _TEMPLATES["paper.pdf_path"].format(
+                pdf_path=cfg.paper.pdf_path, work_dir=work_dir
             )
         else:
             raise ValueError(
@@ -76,7 +102,13 @@ def main(cfg: DictConfig) -> None:
                 break
             if not user_input:
                 continue
-            response = agent.run(user_input)
+            try:
+                response = agent.run(user_input)
+            except KeyboardInterrupt:
+                # Abandon this request only; stop its mdrun so nothing keeps running.
+                agent.stop()
+                print("\nInterrupted.\n")
+                continue
             print(f"\nAgent: {response}\n")
 
     else:
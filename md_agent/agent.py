@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-import json
-from collections.abc import Generator
+import asyncio
+import sys
+from collections.abc import Generator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import anthropic
+from anthropic.types import TextBlockParam, ToolParam
 from omegaconf import DictConfig
 
+from md_agent.clients import get_anthropic_client
 from md_agent.config.hydra_utils import (
     generate_mdp_from_config,
     load_config,
@@ -27,6 +32,7 @@ from md_agent.tools.wandb_tools import (
     wandb_stop_monitor,
 )
 from md_agent.utils.file_utils import list_files, read_file
+from md_agent.utils.json_utils import dumps as jdumps
 
 # ── System prompt ──────────────────────────────────────────────────────
 
@@ -83,7 +89,7 @@ Always confirm extracted config with user before launching multi-hour simulation
 
 # ── Tool definitions ───────────────────────────────────────────────────
 
-TOOLS: list[dict[str, Any]] = [
+TOOLS: tuple[dict[str, Any], ...] = (
     # ── GROMACS ──
     {
         "name": "run_grompp",
@@ -120,7 +126,11 @@ TOOLS: list[dict[str, Any]] = [
                     "description": "deffnm prefix for all output files",
                 },
                 "plumed_file": {"type": ["string", "null"], "default": None},
-                "n_cores": {"type": "integer", "default": 1},
+                "n_cores": {
+                    "type": ["integer", "null"],
+                    "default": None,
+                    "description": "OpenMP threads; defaults to all available cores",
+                },
                 "gpu_id": {"type": ["string", "null"], "default": None},
                 "append": {"type": "boolean", "default": False},
                 "cpt_file": {"type": ["string", "null"], "default": None},
@@ -326,13 +336,17 @@ TOOLS: list[dict[str, Any]] = [
     },
     {
         "name": "wandb_log_from_edr",
-        "description": "Parse a GROMACS .edr file and log energy terms to wandb.",
+        "description": (
+            "Parse a GROMACS .edr file and log energy terms to wandb. "
+            "Returns next_byte_offset; pass it back as byte_offset to log only new frames."
+        ),
         "input_schema": {
             "type": "object",
             "properties": {
                 "edr_file": {"type": "string"},
                 "energy_terms": {"type": "array", "items": {"type": "string"}},
                 "step_offset": {"type": "integer", "default": 0},
+                "byte_offset": {"type": "integer", "default": 0},
             },
             "required": ["edr_file", "energy_terms"],
         },
@@ -570,7 +584,76 @@ TOOLS: list[dict[str, Any]] = [
             "required": ["agent_type", "task"],
         },
     },
-]
+)
+
+# ── Prompt caching ─────────────────────────────────────────────────────
+# Tools and system prompt are identical on every request, so mark the end of
+# that prefix as a cache breakpoint: Anthropic then processes it once per
+# cache window instead of on every loop iteration.
+# Both are built once at import as the SDK's typed params, ready to pass as-is.
+# Tuples stop an agent from adding or removing entries in the shared sequence;
+# the dicts inside are still plain dicts and must be treated as read-only.
+_CACHED_TOOLS: tuple[ToolParam, ...] = (
+    *(ToolParam(**tool) for tool in TOOLS[:-1]),  # type: ignore[typeddict-item]
+    ToolParam(**TOOLS[-1], cache_control={"type": "ephemeral"}),  # type: ignore[typeddict-item]
+)
+_CACHED_SYSTEM: tuple[TextBlockParam, ...] = (
+    TextBlockParam(type="text", text=SYSTEM_PROMPT, cache_control={"type": "ephemeral"}),
+)
+
+# Tools that only read: they write no file another tool could pick up and touch
+# no GROMACS/wandb state, so their order within a turn cannot matter.
+# Consecutive calls to these are dispatched concurrently; every other tool runs
+# alone, in order, so e.g. grompp → mdrun and download_pdf → extract_text_from_pdf
+# keep their sequence.
+_PARALLEL_SAFE_TOOLS = frozenset(
+    {
+        "check_gromacs_energy",
+        "validate_plumed_input",
+        "analyze_hills",
+        "load_config",
+        "validate_config",
+        "search_semantic_scholar",
+        "fetch_arxiv_paper",
+        "extract_text_from_pdf",
+        "extract_md_settings_from_text",
+        "read_file",
+        "list_files",
+    }
+)
+_MAX_TOOL_WORKERS = 8
+
+
+def _tool_batches(blocks: list[Any]) -> list[list[Any]]:
+    """Group tool_use blocks into ordered batches that may run concurrently."""
+    batches: list[list[Any]] = []
+    for block in blocks:
+        if (
+            block.name in _PARALLEL_SAFE_TOOLS
+            and batches
+            and batches[-1][-1].name in _PARALLEL_SAFE_TOOLS
+        ):
+            batches[-1].append(block)
+        else:
+            batches.append([block])
+    return batches
+
+
+_THINKING_BLOCK_TYPES = frozenset({"thinking", "redacted_thinking"})
+
+
+def _with_cache_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return *messages* with a cache breakpoint on the final (user) message.
+
+    The marker is applied to a shallow copy so stored history stays free of
+    stale breakpoints; only the newest prefix is ever marked.
+    """
+    last = messages[-1]
+    content = last["content"]
+    blocks = [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+    blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return [*messages[:-1], {**last, "content": blocks}]
+
 
 # ── Agent ──────────────────────────────────────────────────────────────
 
@@ -583,20 +666,23 @@ class MDAgent:
         self.work_dir = Path(work_dir)
         self.work_dir.mkdir(parents=True, exist_ok=True)
 
-        self._client = anthropic.Anthropic()
+        self._client = get_anthropic_client()
+        self._aclient: anthropic.AsyncAnthropic | None = None  # created by arun()
         self._gmx = GROMACSRunner(work_dir=str(self.work_dir))
         self._plumed = PlumedGenerator()
         self._paper_retriever = PaperRetriever()
         self._settings_extractor = MDSettingsExtractor(self._client)
 
         self._messages: list[dict[str, Any]] = []
+        # History before this index has already had its thinking blocks dropped.
+        self._n_settled = 0
 
         # Build tool dispatch table
-        self._handlers: dict[str, Any] = self._build_handlers()
+        self._handlers: Mapping[str, Any] = self._build_handlers()
 
     # ── Tool dispatch ───────────────────────────────────────────────────
 
-    def _build_handlers(self) -> dict[str, Any]:
+    def _build_handlers(self) -> Mapping[str, Any]:
         gmx = self._gmx
         plumed = self._plumed
         pr = self._paper_retriever
@@ -611,7 +697,7 @@ class MDAgent:
             ok, errors = validate_extracted_settings(config)
             return {"valid": ok, "errors": errors}
 
-        return {
+        handlers = {
             # GROMACS
             "run_grompp": gmx.grompp,
             "run_mdrun": gmx.mdrun,
@@ -649,6 +735,10 @@ class MDAgent:
             # Specialist agents
             "delegate_to_specialist": self._delegate_to_specialist,
         }
+        # Interned keys: lookups from _execute_tool hit the pointer-equality fast
+        # path once the incoming name is interned too. The proxy only blocks
+        # adding or replacing entries; the handlers themselves are ordinary objects.
+        return MappingProxyType({sys.intern(k): v for k, v in handlers.items()})
 
     def _delegate_to_specialist(self, agent_type: str, task: str) -> dict:
         """Run a specialist LangChain agent synchronously and return its output."""
@@ -671,7 +761,7 @@ class MDAgent:
             return {"error": str(exc)}
 
     def _execute_tool(self, name: str, inputs: dict[str, Any]) -> Any:
-        handler = self._handlers.get(name)
+        handler = self._handlers.get(sys.intern(name))
         if handler is None:
             return {"error": f"Unknown tool: {name}"}
         try:
@@ -679,45 +769,182 @@ class MDAgent:
         except Exception as exc:
             return {"error": str(exc), "tool": name}
 
+    def _execute_batch(
+        self,
+        batch: list[Any],
+        pool: ThreadPoolExecutor | None = None,
+        started: dict[str, Future] | None = None,
+    ) -> list[Any]:
+        """Execute one batch from _tool_batches(); results keep block order.
+
+        *started* maps tool_use ids to futures already submitted while the
+        response was still streaming; those are awaited instead of re-run.
+        """
+        started = started or {}
+        if len(batch) == 1 and batch[0].id not in started:
+            return [self._execute_tool(batch[0].name, batch[0].input)]
+        if pool is None:
+            with ThreadPoolExecutor(max_workers=min(_MAX_TOOL_WORKERS, len(batch))) as own:
+                return self._execute_batch(batch, own, started)
+        futures = [
+            started.get(b.id) or pool.submit(self._execute_tool, b.name, b.input) for b in batch
+        ]
+        return [f.result() for f in futures]
+
     # ── Agentic loop ────────────────────────────────────────────────────
 
-    def run(self, user_message: str) -> str:
-        """Run the agentic loop until Claude reaches end_turn."""
+    def _start_turn(self, user_message: str) -> None:
+        """Append a new user message, first dropping thinking from finished turns.
+
+        Thinking is only needed for the assistant turn still in progress, so
+        blocks from earlier turns are removed once, when a new user turn opens.
+        Within a tool-use loop the history is append-only, which keeps the
+        cached prefix valid from one request to the next.
+        """
+        for msg in self._messages[self._n_settled :]:
+            if msg["role"] != "assistant" or isinstance(msg["content"], str):
+                continue
+            kept = [b for b in msg["content"] if b.type not in _THINKING_BLOCK_TYPES]
+            if kept:
+                msg["content"] = kept
         self._messages.append({"role": "user", "content": user_message})
+        self._n_settled = len(self._messages)
 
+    def run(self, user_message: str) -> str:
+        """Run the agentic loop until Claude reaches end_turn.
+
+        Responses are streamed so that read-only tool calls at the head of a
+        turn start executing while the model is still generating the rest.
+        A KeyboardInterrupt discards the unfinished turn from the history, so
+        the next call starts from a consistent conversation.
+        """
+        n_before = len(self._messages)
+        self._start_turn(user_message)
+        try:
+            return self._run_loop()
+        except KeyboardInterrupt:
+            # A tool_use left without its tool_result would fail every later request
+            del self._messages[n_before:]
+            self._n_settled = n_before
+            raise
+
+    def stop(self) -> None:
+        """Stop the running mdrun, if any."""
+        self._gmx._cleanup()
+
+    def _run_loop(self) -> str:
         while True:
-            response = self._client.messages.create(
+            with ThreadPoolExecutor(max_workers=_MAX_TOOL_WORKERS) as pool:
+                started: dict[str, Future] = {}
+                n_tool_blocks = 0
+                with self._client.messages.stream(
+                    model="claude-opus-4-6",
+                    max_tokens=16000,
+                    thinking={"type": "adaptive"},
+                    system=_CACHED_SYSTEM,
+                    tools=_CACHED_TOOLS,
+                    messages=_with_cache_breakpoint(self._messages),
+                ) as stream:
+                    for event in stream:
+                        if event.type != "content_block_stop":
+                            continue
+                        block = event.content_block
+                        if block.type != "tool_use":
+                            continue
+                        # Only the leading run of parallel-safe calls starts early;
+                        # anything after a stateful call waits for the full response.
+                        if block.name in _PARALLEL_SAFE_TOOLS and len(started) == n_tool_blocks:
+                            started[block.id] = pool.submit(
+                                self._execute_tool, block.name, block.input
+                            )
+                        n_tool_blocks += 1
+                    response = stream.get_final_message()
+
+                # Preserve full content (including thinking blocks) in history
+                self._messages.append({"role": "assistant", "content": response.content})
+
+                if response.stop_reason == "end_turn":
+                    return self._extract_text(response.content)
+
+                if response.stop_reason != "tool_use":
+                    # Unexpected stop reason — return what we have
+                    return self._extract_text(response.content)
+
+                # Execute all tool calls (independent ones concurrently) and collect results
+                tool_blocks = [b for b in response.content if b.type == "tool_use"]
+                tool_results: list[dict[str, Any]] = []
+                for batch in _tool_batches(tool_blocks):
+                    for block, result in zip(batch, self._execute_batch(batch, pool, started)):
+                        tool_results.append(
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": block.id,
+                                "content": jdumps(result),
+                            }
+                        )
+
+            self._messages.append({"role": "user", "content": tool_results})
+
+    async def arun(self, user_message: str) -> str:
+        """Async variant of run() for callers that own an event loop.
+
+        API calls go through AsyncAnthropic; tools stay synchronous and run in
+        worker threads, so the loop is never blocked. run() is kept as its own
+        sync loop rather than an asyncio.run() wrapper because the async
+        client's connection pool is bound to the loop it was first used on.
+        """
+        if self._aclient is None:
+            self._aclient = anthropic.AsyncAnthropic()
+        self._start_turn(user_message)
+
+        while True:
+            started: dict[str, asyncio.Future] = {}
+            n_tool_blocks = 0
+            async with self._aclient.messages.stream(
                 model="claude-opus-4-6",
                 max_tokens=16000,
                 thinking={"type": "adaptive"},
-                system=SYSTEM_PROMPT,
-                tools=TOOLS,
-                messages=self._messages,
-            )
+                system=_CACHED_SYSTEM,
+                tools=_CACHED_TOOLS,
+                messages=_with_cache_breakpoint(self._messages),
+            ) as stream:
+                async for event in stream:
+                    if event.type != "content_block_stop":
+                        continue
+                    block = event.content_block
+                    if block.type != "tool_use":
+                        continue
+                    if block.name in _PARALLEL_SAFE_TOOLS and len(started) == n_tool_blocks:
+                        started[block.id] = asyncio.ensure_future(
+                            asyncio.to_thread(self._execute_tool, block.name, block.input)
+                        )
+                    n_tool_blocks += 1
+                response = await stream.get_final_message()
 
-            # Preserve full content (including thinking blocks) in history
             self._messages.append({"role": "assistant", "content": response.content})
 
-            if response.stop_reason == "end_turn":
-                return self._extract_text(response.content)
-
             if response.stop_reason != "tool_use":
-                # Unexpected stop reason — return what we have
+                # end_turn or unexpected stop — let early read-only calls settle, then return
+                await asyncio.gather(*started.values())
                 return self._extract_text(response.content)
 
-            # Execute all tool calls and collect results
+            tool_blocks = [b for b in response.content if b.type == "tool_use"]
             tool_results: list[dict[str, Any]] = []
-            for block in response.content:
-                if block.type != "tool_use":
-                    continue
-                result = self._execute_tool(block.name, block.input)
-                tool_results.append(
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": json.dumps(result, default=str),
-                    }
+            for batch in _tool_batches(tool_blocks):
+                results = await asyncio.gather(
+                    *(
+                        started.get(b.id) or asyncio.to_thread(self._execute_tool, b.name, b.input)
+                        for b in batch
+                    )
                 )
+                for block, result in zip(batch, results):
+                    tool_results.append(
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": block.id,
+                            "content": jdumps(result),
+                        }
+                    )
 
             self._messages.append({"role": "user", "content": tool_results})
 
@@ -732,7 +959,7 @@ class MDAgent:
           agent_done    — {"type": "agent_done", "final_text": str}
           error         — {"type": "error", "message": str}
         """
-        self._messages.append({"role": "user", "content": user_message})
+        self._start_turn(user_message)
 
         try:
             while True:
@@ -740,9 +967,9 @@ class MDAgent:
                     model="claude-opus-4-6",
                     max_tokens=16000,
                     thinking={"type": "adaptive"},
-                    system=SYSTEM_PROMPT,
-                    tools=TOOLS,
-                    messages=self._messages,
+                    system=_CACHED_SYSTEM,
+                    tools=_CACHED_TOOLS,
+                    messages=_with_cache_breakpoint(self._messages),
                 ) as stream:
                     for event in stream:
                         # Text and thinking deltas arrive as content_block_delta events
@@ -772,31 +999,31 @@ class MDAgent:
                     }
                     return
 
-                # Execute all tool calls in this response
+                # Execute all tool calls in this response (independent ones concurrently)
+                tool_blocks = [b for b in final_message.content if b.type == "tool_use"]
                 tool_results: list[dict[str, Any]] = []
-                for block in final_message.content:
-                    if block.type != "tool_use":
-                        continue
-                    yield {
-                        "type": "tool_start",
-                        "tool_use_id": block.id,
-                        "tool_name": block.name,
-                        "tool_input": block.input,
-                    }
-                    result = self._execute_tool(block.name, block.input)
-                    yield {
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "tool_name": block.name,
-                        "result": result,
-                    }
-                    tool_results.append(
-                        {
+                for batch in _tool_batches(tool_blocks):
+                    for block in batch:
+                        yield {
+                            "type": "tool_start",
+                            "tool_use_id": block.id,
+                            "tool_name": block.name,
+                            "tool_input": block.input,
+                        }
+                    for block, result in zip(batch, self._execute_batch(batch)):
+                        yield {
                             "type": "tool_result",
                             "tool_use_id": block.id,
-                            "content": json.dumps(result, default=str),
+                            "tool_name": block.name,
+                            "result": result,
                         }
-                    )
+                        tool_results.append(
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": block.id,
+                                "content": jdumps(result),
+                            }
+                        )
 
                 self._messages.append({"role": "user", "content": tool_results})
 
@@ -808,6 +1035,4 @@ class MDAgent:
 
     @staticmethod
     def _extract_text(content: list) -> str:
-        return " ".join(
-            block.text for block in content if hasattr(block, "text") and block.type == "text"
-        )
+        return " ".join(block.text for block in content if block.type == "text")
@@ -19,12 +19,13 @@ from md_agent.agents.base import build_executor, stream_executor, sync_run
 
 def _make_tools(work_dir: str):
     wd = Path(work_dir)
+    wd_resolved = wd.resolve()
 
     # ── helpers ─────────────────────────────────────────────────────────
 
     def _safe_read(rel_path: str, max_lines: int = 5000) -> str:
         p = (wd / rel_path).resolve()
-        if not str(p).startswith(str(wd.resolve())):
+        if not p.is_relative_to(wd_resolved):
             return "Error: path is outside the session directory."
         if not p.exists():
             return f"File not found: {rel_path}"
@@ -205,7 +205,7 @@ def _make_tools(work_dir: str):
             return json.dumps({"error": "filename must not contain path separators or '..'"})
         dest = wd / filename
         # Resolve and verify destination stays inside work_dir
-        if not str(dest.resolve()).startswith(str(wd.resolve())):
+        if not dest.resolve().is_relative_to(wd.resolve()):
             return json.dumps({"error": "Refusing to write outside session directory."})
         dest.write_text(content)
         return json.dumps({"saved_path": str(dest), "filename": filename, "bytes": len(content)})
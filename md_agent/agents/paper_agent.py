@@ -4,35 +4,34 @@ Workflow
 --------
 1. Accept an arXiv ID, DOI, title, or keyword search query
 2. Locate and download the paper (Semantic Scholar or arXiv)
-3. Extract the Methods section text via pdfplumber
+3. Extract the Methods section text (PyMuPDF, or pdfplumber as fallback)
 4. Use Claude to parse structured MD settings (GROMACS + PLUMED)
 5. Return a clear structured summary ready for the user to apply
 """
 
 from __future__ import annotations
 
+import io
 import json
-import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from langchain_core.tools import tool
 
 from md_agent.agents.base import build_executor, stream_executor, sync_run
+from md_agent.clients import get_anthropic_client
 from md_agent.tools.paper_tools import MDSettingsExtractor, PaperRetriever
+from md_agent.utils.json_utils import dumps as jdumps
 
 # ── Singleton helpers (shared across tool calls in one session) ────────
 
 _retriever = PaperRetriever()
-_extractor: MDSettingsExtractor | None = None  # lazy — needs Anthropic client
 
 
+@lru_cache(maxsize=1)
 def _get_extractor() -> MDSettingsExtractor:
-    global _extractor
-    if _extractor is None:
-        import anthropic
-
-        _extractor = MDSettingsExtractor(anthropic.Anthropic())
-    return _extractor
+    # Lazy — the shared Anthropic client is only built on first extraction.
+    return MDSettingsExtractor(get_anthropic_client())
 
 
 # ── Tools ──────────────────────────────────────────────────────────────
@@ -44,7 +43,7 @@ def search_papers(query: str) -> str:
     Returns a JSON list of up to 5 papers with title, abstract, authors, year, and PDF URL.
     """
     results = _retriever.search_semantic_scholar(query, limit=5)
-    return json.dumps(results, default=str, indent=2)
+    return jdumps(results, indent=True)
 
 
 @tool
@@ -53,7 +52,7 @@ def fetch_arxiv_paper(arxiv_id: str) -> str:
     Returns title, abstract, PDF URL, authors, published date, and arXiv categories.
     """
     result = _retriever.fetch_arxiv_paper(arxiv_id)
-    return json.dumps(result, default=str, indent=2)
+    return jdumps(result, indent=True)
 
 
 @tool
@@ -61,14 +60,17 @@ def download_and_read_paper(pdf_url: str) -> str:
     """Download a paper PDF from a URL and extract the Methods section text (up to 30 000 chars).
     Focuses on the Methods / Simulation Details section where MD parameters are described.
     """
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
+    buf = io.BytesIO()
     try:
-        _retriever.download_pdf(pdf_url, str(tmp_path))
-        text = _retriever.extract_text_from_pdf(str(tmp_path))
-        return text[:30_000] if len(text) > 30_000 else text
-    finally:
-        tmp_path.unlink(missing_ok=True)
+        _retriever.stream_pdf(pdf_url, buf)
+    except Exception as exc:
+        return jdumps({"error": f"PDF download failed: {exc}"})
+    buf.seek(0)
+    # The extractor enforces the 30 000-char budget itself; no re-slicing here.
+    result = _retriever.extract_text_from_pdf(buf, max_chars=30_000)
+    if "error" in result:
+        return jdumps(result)
+    return result["text"]
 
 
 @tool
@@ -78,7 +80,7 @@ def extract_md_settings_from_paper(paper_text: str, paper_title: str = "") -> st
     All values are unit-normalised to GROMACS conventions (ps, nm, kJ/mol, K).
     """
     result = _get_extractor().extract_md_settings_from_text(paper_text, paper_title=paper_title)
-    return json.dumps(result, default=str, indent=2)
+    return jdumps(result, indent=True)
 
 
 TOOLS = [search_papers, fetch_arxiv_paper, download_and_read_paper, extract_md_settings_from_paper]
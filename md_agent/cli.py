@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -46,20 +49,65 @@ def _yesno(question: str, default: bool = True) -> bool:
     return raw in ("y", "yes")
 
 
+def _run_stamp() -> str:
+    """Timestamp plus PID, unique even when a sweep launches several runs per second."""
+    return f"{time.strftime('%Y-%m-%d_%H-%M-%S')}_{os.getpid()}"
+
+
+def _stage(src: Path, dst: Path) -> None:
+    """Copy *src* to *dst*, staying in the kernel where possible.
+
+    ``copy_file_range`` lets CoW filesystems (XFS, Btrfs) reflink instead of
+    moving bytes. Hardlinks are deliberately avoided: the agent may rewrite
+    staged files (e.g. topology edits) and must never touch the originals.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                remaining = os.fstat(fin.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            if remaining == 0:
+                shutil.copymode(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy(src, dst)
+
+
 # ── Lazy imports (keep startup fast) ──────────────────────────────────────────
 
 
+@lru_cache(maxsize=4)
+def _compose_base(conf_dir: str, overrides: tuple[str, ...]) -> dict:
+    """Compose the Hydra config once per (conf_dir, overrides) and snapshot it.
+
+    Interpolations are kept unresolved so values such as ``${gromacs.temperature}``
+    still follow later updates. Callers must not mutate the returned dict.
+    """
+    from hydra import compose, initialize_config_dir
+    from hydra.core.global_hydra import GlobalHydra
+    from omegaconf import OmegaConf
+
+    GlobalHydra.instance().clear()
+    with initialize_config_dir(config_dir=conf_dir, job_name="amd"):
+        cfg = compose(config_name="config", overrides=list(overrides))
+    return OmegaConf.to_container(cfg, resolve=False)  # type: ignore[return-value]
+
+
 def _load_hydra_cfg(
     conf_dir: str,
     overrides: list[str],
     work_dir: str,
 ) -> object:
-    from hydra import compose, initialize_config_dir
-    from hydra.core.global_hydra import GlobalHydra
+    from omegaconf import OmegaConf
 
-    GlobalHydra.instance().clear()
-    with initialize_config_dir(config_dir=conf_dir, job_name="amd"):
-        cfg = compose(config_name="config", overrides=overrides + [f"run.work_dir={work_dir}"])
+    cfg = OmegaConf.create(_compose_base(conf_dir, tuple(overrides)))
+    cfg.run.work_dir = work_dir
+    OmegaConf.set_struct(cfg, True)
     return cfg
 
 
@@ -180,6 +228,21 @@ def _setup_from_description(
 
 # ── Built-in examples ─────────────────────────────────────────────────────────
 
+_ALA_PROMPT = (
+    "Run a well-tempered metadynamics simulation of alanine dipeptide in vacuum "
+    "(CHARMM36m force field, dodecahedron periodic box). "
+    "Work directory: {work_dir}. "
+    "CVs (1-based PLUMED indices): "
+    "  phi = TORSION ATOMS=5,7,9,15   (CY_ACE – N_ALA – CA_ALA – C_ALA), "
+    "  psi = TORSION ATOMS=7,9,15,17  (N_ALA – CA_ALA – C_ALA – N_NME). "
+    "ala2.gro and topol.top are already in the work directory. "
+    "Steps: validate_config → generate_mdp_from_config → generate_plumed_metadynamics "
+    "→ run_grompp (with ala2.gro and topol.top) "
+    "→ wandb_init_run (if project set) → run_mdrun → "
+    "wandb_start_background_monitor → wait_mdrun → analyze_hills → wandb_stop_monitor. "
+    "Summarise the Ramachandran FES: identify C7eq, C7ax, and alpha-helix basins."
+)
+
 _EXAMPLES = {
     "ala_dipeptide": {
         "label": "Alanine Dipeptide — phi/psi metadynamics (vacuum)",
@@ -189,6 +252,7 @@ _EXAMPLES = {
             "plumed/collective_variables=ala_dipeptide",
             "gromacs=vacuum",
         ],
+        "prompt": _ALA_PROMPT,
     },
 }
 
@@ -203,14 +267,21 @@ def _run_example(name: str, work_dir: str, conf_dir: str) -> None:
 
     # Point the user to the example README
     examples_dir = Path(__file__).parents[1] / "examples" / name
+    # One directory read answers every existence check below (cheap on NFS/Lustre).
+    try:
+        with os.scandir(examples_dir) as it:
+            entries = {e.name for e in it if e.is_file()}
+    except OSError:
+        entries = set()
+
     readme = examples_dir / "README.md"
-    if readme.exists():
+    if readme.name in entries:
         print(f"==> See {readme} for full instructions and preparation steps.")
 
     # Check that system files exist (output of prepare.sh lives in examples_dir)
     gro = examples_dir / "ala2.gro"
     top = examples_dir / "topol.top"
-    if not gro.exists() or not top.exists():
+    if gro.name not in entries or top.name not in entries:
         prepare_sh = examples_dir / "prepare.sh"
         print(
             f"\nSystem files not found in {examples_dir}.\n"
@@ -219,43 +290,26 @@ def _run_example(name: str, work_dir: str, conf_dir: str) -> None:
         )
         sys.exit(1)
 
-    from hydra import compose, initialize_config_dir
-    from hydra.core.global_hydra import GlobalHydra
-    from omegaconf import OmegaConf
+    from omegaconf import OmegaConf, open_dict
 
     from md_agent.agent import MDAgent
 
-    GlobalHydra.instance().clear()
-    with initialize_config_dir(config_dir=conf_dir, job_name="amd"):
-        cfg = compose(
-            config_name="config",
-            overrides=ex["overrides"] + [f"run.work_dir={work_dir}"],
-        )
+    cfg = _load_hydra_cfg(conf_dir, ex["overrides"], work_dir)
 
-    OmegaConf.update(cfg, "system.topology", str(top))
-    OmegaConf.update(cfg, "system.coordinates", str(gro))
+    with open_dict(cfg):
+        cfg.system.topology = str(top)
+        cfg.system.coordinates = str(gro)
 
-    Path(work_dir).mkdir(parents=True, exist_ok=True)
-    shutil.copy(gro, Path(work_dir) / "ala2.gro")
-    shutil.copy(top, Path(work_dir) / "topol.top")
-    for itp in examples_dir.glob("*.itp"):
-        shutil.copy(itp, Path(work_dir) / itp.name)
+    wd = Path(work_dir)
+    wd.mkdir(parents=True, exist_ok=True)
+    pairs = [(gro, wd / "ala2.gro"), (top, wd / "topol.top")]
+    pairs += [(examples_dir / n, wd / n) for n in sorted(entries) if n.endswith(".itp")]
+    with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as pool:
+        list(pool.map(lambda pair: _stage(*pair), pairs))
 
-    prompt = (
-        "Run a well-tempered metadynamics simulation of alanine dipeptide in vacuum "
-        "(CHARMM36m force field, dodecahedron periodic box). "
-        f"Work directory: {work_dir}. "
-        "CVs (1-based PLUMED indices): "
-        "  phi = TORSION ATOMS=5,7,9,15   (CY_ACE – N_ALA – CA_ALA – C_ALA), "
-        "  psi = TORSION ATOMS=7,9,15,17  (N_ALA – CA_ALA – C_ALA – N_NME). "
-        "ala2.gro and topol.top are already in the work directory. "
-        "Steps: validate_config → generate_mdp_from_config → generate_plumed_metadynamics "
-        "→ run_grompp (with ala2.gro and topol.top) "
-        "→ wandb_init_run (if project set) → run_mdrun → "
-        "wandb_start_background_monitor → wait_mdrun → analyze_hills → wandb_stop_monitor. "
-        "Summarise the Ramachandran FES: identify C7eq, C7ax, and alpha-helix basins."
-    )
+    prompt = ex["prompt"].format(work_dir=work_dir)
 
+    OmegaConf.resolve(cfg)
     agent = MDAgent(cfg=cfg, work_dir=work_dir)
     print("\n==> Starting MD Agent...\n")
     result = agent.run(prompt)
@@ -293,7 +347,7 @@ def _interactive_setup(work_dir: str | None) -> None:
             "Which example?",
             [(k, v["label"]) for k, v in _EXAMPLES.items()],
         )
-        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        ts = _run_stamp()
         wdir = work_dir or f"outputs/{ex_name}_{ts}"
         _run_example(ex_name, wdir, conf_dir)
         return
@@ -310,7 +364,7 @@ def _interactive_setup(work_dir: str | None) -> None:
             pdb_path = f"https://files.rcsb.org/download/{raw.upper()}.pdb"
             print(f"  Will download: {pdb_path}")
         else:
-            pdb_path = str(Path(raw).resolve())
+            pdb_path = str(Path(raw).absolute())
             if not Path(pdb_path).exists():
                 print(f"  WARNING: file not found at {pdb_path}")
     else:
@@ -327,7 +381,7 @@ def _interactive_setup(work_dir: str | None) -> None:
         wandb_project = _prompt("WandB project name", default="amd-agent")
 
     # ── Output directory ─────────────────────────────────────────────────────
-    ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    ts = _run_stamp()
     default_wdir = f"outputs/{ts}"
     wdir = work_dir or _prompt("Output directory", default=default_wdir)
 
@@ -337,22 +391,24 @@ def _interactive_setup(work_dir: str | None) -> None:
     else:
         cfg, prompt = _setup_from_description(wdir, conf_dir, pdb_path, wandb_project)
 
-    # ── Patch WandB project in config ────────────────────────────────────────
-    if wandb_project:
-        from omegaconf import OmegaConf
-
-        OmegaConf.update(cfg, "wandb.project", wandb_project)
-
     # ── Copy PDB into work_dir if local ──────────────────────────────────────
+    dest: Path | None = None
     if pdb_path and not pdb_path.startswith("http"):
         Path(wdir).mkdir(parents=True, exist_ok=True)
         dest = Path(wdir) / Path(pdb_path).name
         if not dest.exists():
-            shutil.copy(pdb_path, dest)
+            _stage(Path(pdb_path), dest)
             print(f"  Copied {pdb_path} → {dest}")
-        from omegaconf import OmegaConf
 
-        OmegaConf.update(cfg, "system.coordinates", str(dest))
+    # ── Patch WandB project / coordinates in config ──────────────────────────
+    if wandb_project or dest is not None:
+        from omegaconf import open_dict
+
+        with open_dict(cfg):
+            if wandb_project:
+                cfg.wandb.project = wandb_project
+            if dest is not None:
+                cfg.system.coordinates = str(dest)
 
     # ── Confirm before running ───────────────────────────────────────────────
     print(f"\n==> Work directory : {wdir}")
@@ -367,8 +423,12 @@ def _interactive_setup(work_dir: str | None) -> None:
         return
 
     # ── Run ──────────────────────────────────────────────────────────────────
+    from omegaconf import OmegaConf
+
     from md_agent.agent import MDAgent
 
+    # All mutations are done; resolve interpolations once for the agent.
+    OmegaConf.resolve(cfg)
     Path(wdir).mkdir(parents=True, exist_ok=True)
     agent = MDAgent(cfg=cfg, work_dir=wdir)
     print("\n==> Starting MD Agent...\n")
@@ -412,7 +472,7 @@ def main() -> None:
         except FileNotFoundError as e:
             print(f"ERROR: {e}")
             sys.exit(1)
-        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        ts = _run_stamp()
         wdir = args.work_dir or f"outputs/{args.example}_{ts}"
         _run_example(args.example, wdir, conf_dir)
     else:
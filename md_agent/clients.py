@@ -0,0 +1,18 @@
+"""Process-wide Anthropic API client.
+
+Every ``anthropic.Anthropic`` instance owns its own httpx connection pool, so
+sharing one per process lets MDAgent sessions and the paper extractor reuse
+keep-alive connections instead of paying a TCP+TLS handshake each.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import anthropic
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_client() -> anthropic.Anthropic:
+    """Return the shared sync client (reads ANTHROPIC_API_KEY on first use)."""
+    return anthropic.Anthropic()
@@ -4,11 +4,106 @@ from __future__ import annotations
 
 import atexit
 import os
+import shlex
+import socket
 import subprocess
+import threading
+import uuid
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+# Name prefix of the idle containers used for `docker exec` (see GROMACSRunner)
+_WARM_NAME_PREFIX = "amd-gmx-warm-"
+_sweep_lock = threading.Lock()
+_swept = False
+
+# GROMACS' default GMX_OPENMP_MAX_THREADS; mdrun aborts when -ntomp exceeds it.
+_MAX_OMP_THREADS = 64
+
+
+def _available_cores() -> int:
+    """Cores this process may use: CPU affinity, capped by any cgroup v2 CPU quota."""
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        n = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            n = min(n, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    return n
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@lru_cache(maxsize=1)
+def _owner_id() -> str:
+    """Identify this host and PID namespace: hostname plus the kernel boot id.
+
+    Containerised servers get their own hostname, so two processes share an
+    owner id only when they can see each other's PIDs.
+    """
+    try:
+        boot_id = Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+    except OSError:
+        boot_id = ""
+    return f"{socket.gethostname()}/{boot_id}"
+
+
+def _sweep_orphaned_warm_containers() -> None:
+    """Remove warm containers left behind by processes that died (once per process).
+
+    Only containers labelled with this host's owner id are considered, since
+    their ``amd.pid`` can be checked here; unlabelled ones are never touched.
+    """
+    global _swept
+    with _sweep_lock:
+        if _swept:
+            return
+        _swept = True
+        try:
+            listed = subprocess.run(
+                [
+                    "docker",
+                    "ps",
+                    "-a",
+                    "--filter",
+                    f"name={_WARM_NAME_PREFIX}",
+                    "--filter",
+                    f"label=amd.owner={_owner_id()}",
+                    "--format",
+                    '{{.ID}} {{.Label "amd.pid"}}',
+                ],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+            orphans = [
+                cid
+                for cid, _, pid in (line.partition(" ") for line in listed.stdout.splitlines())
+                if pid.isdigit() and not _pid_alive(int(pid))
+            ]
+            if orphans:
+                subprocess.Popen(
+                    ["docker", "rm", "-f", *orphans],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        except Exception:
+            pass
+
 
 @dataclass
 class GMXResult:
@@ -40,7 +135,12 @@ class GROMACSRunner:
     When ``GMX_DOCKER_IMAGE`` is set in the environment, every ``gmx`` call is
     wrapped in ``docker run --rm -w /work -v {work_dir}:/work {image} gmx ...``
     so that GROMACS runs inside the container with the session directory
-    bind-mounted at ``/work``.
+    bind-mounted at ``/work``. Blocking commands in ``work_dir`` instead go
+    through ``docker exec`` into one long-lived container per runner, which
+    skips the container start-up on every call; set ``GMX_DOCKER_WARM=0`` to
+    use a fresh ``docker run`` each time. ``mdrun`` always gets its own
+    container so that it can be stopped independently. If the warm container
+    cannot be started or exec'd into, the runner falls back to ``docker run``.
     """
 
     def __init__(self, gmx_executable: str = "gmx", work_dir: str = "."):
@@ -48,8 +148,14 @@ class GROMACSRunner:
         self.work_dir = Path(work_dir)
         self._mdrun_proc: subprocess.Popen | None = None
         self._docker_image: str | None = os.environ.get("GMX_DOCKER_IMAGE")
+        self._warm = os.environ.get("GMX_DOCKER_WARM", "1") != "0"
+        self._warm_container: str | None = None
+        self._warm_lock = threading.Lock()
+        if self._docker_image and self._warm:
+            _sweep_orphaned_warm_containers()
         # Ensure mdrun is terminated if Python exits unexpectedly
         atexit.register(self._cleanup)
+        atexit.register(self.close)
 
     # ── Internal helpers ────────────────────────────────────────────────
 
@@ -58,31 +164,153 @@ class GROMACSRunner:
         gmx_args: list[str],
         work_dir: Path,
         gpu_id: str | None = None,
+        warm: bool = True,
     ) -> list[str]:
         """Return the full command list, Docker-wrapped when image is configured."""
+        return self._wrap([self.gmx] + gmx_args, work_dir, gpu_id, warm)
+
+    def _wrap(
+        self,
+        argv: list[str],
+        work_dir: Path,
+        gpu_id: str | None = None,
+        warm: bool = True,
+    ) -> list[str]:
         if self._docker_image:
-            docker_prefix = [
-                "docker",
-                "run",
-                "--rm",
-                "-i",
-                "--init",  # tini reaps zombies and forwards signals properly
-                "-w",
-                "/work",
-                "-v",
-                f"{work_dir.resolve()}:/work",
+            prefix = self._exec_prefix(work_dir) if warm else self._docker_prefix(work_dir, gpu_id)
+            return prefix + argv
+        return argv
+
+    def _communicate(
+        self,
+        argv: list[str],
+        work_dir: Path,
+        stdin_text: str | None = None,
+        timeout: int | None = None,
+    ) -> GMXResult:
+        """Run *argv* to completion, retrying with ``docker run`` if the warm container died.
+
+        A failed exec is only retried when the container itself is no longer
+        running; failures of the command inside it are returned as they are.
+        """
+        cmd = self._wrap(argv, work_dir)
+        while True:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if stdin_text else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=str(work_dir),
+                text=True,
+            )
+            stdout, stderr = proc.communicate(input=stdin_text, timeout=timeout)
+            exec_cid = cmd[5] if cmd[:2] == ["docker", "exec"] else None  # see _exec_prefix
+            if proc.returncode == 0 or exec_cid is None or self._container_running(exec_cid):
+                return GMXResult(proc.returncode, stdout, stderr)
+            # The container is gone: stop using it for this runner
+            self.close()
+            self._warm = False
+            cmd = self._docker_prefix(work_dir) + argv
+
+    def _exec_prefix(self, work_dir: Path) -> list[str]:
+        """Return a ``docker exec`` prefix into the warm container, else ``docker run``."""
+        if self._warm and work_dir.absolute() == self.work_dir.absolute():
+            cid = self._ensure_warm_container()
+            if cid:
+                return ["docker", "exec", "-i", "-w", "/work", cid]
+        return self._docker_prefix(work_dir)
+
+    def _ensure_warm_container(self) -> str | None:
+        """Return the id of the running warm container, (re)starting it if needed."""
+        with self._warm_lock:
+            try:
+                if self._warm_container:
+                    if self._container_running(self._warm_container):
+                        return self._warm_container
+                    self._warm_container = None
+                # `docker run --rm -i --init ... <image>` → detached, named, idling
+                prefix = self._docker_prefix(self.work_dir)
+                name = f"{_WARM_NAME_PREFIX}{uuid.uuid4().hex[:12]}"
+                # The labels let a later process on this host sweep it if we die
+                owner = f"amd.owner={_owner_id()}"
+                run_d = prefix[:2] + ["-d", "--name", name, "--label", owner]
+                run_d += ["--label", f"amd.pid={os.getpid()}"]
+                started = subprocess.run(
+                    run_d + prefix[2:] + ["sleep", "infinity"],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+                if started.returncode != 0:
+                    self._warm = False
+                    return None
+                cid = started.stdout.strip()
+                # `run -d` succeeds even if the entrypoint exits at once; prove exec works
+                probe = subprocess.run(
+                    ["docker", "exec", cid, "true"], capture_output=True, timeout=30
+                )
+                if probe.returncode == 0:
+                    self._warm_container = cid
+                else:
+                    self._warm = False
+                    subprocess.Popen(
+                        ["docker", "rm", "-f", cid],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+            except Exception:
+                pass  # fall back to one `docker run` per command
+            return self._warm_container
+
+    @staticmethod
+    def _container_running(cid: str) -> bool:
+        try:
+            state = subprocess.run(
+                ["docker", "inspect", "-f", "{{.State.Running}}", cid],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+        except Exception:
+            return True  # unknown: assume it is still there rather than re-run
+        return state.returncode == 0 and state.stdout.strip() == "true"
+
+    def close(self) -> None:
+        """Remove the warm container, if any (non-blocking)."""
+        cid, self._warm_container = self._warm_container, None
+        if cid:
+            try:
+                subprocess.Popen(
+                    ["docker", "rm", "-f", cid],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except Exception:
+                pass
+
+    def _docker_prefix(self, work_dir: Path, gpu_id: str | None = None) -> list[str]:
+        """Return ``docker run ... <image>``, ready for the command to run in it."""
+        docker_prefix = [
+            "docker",
+            "run",
+            "--rm",
+            "-i",
+            "--init",  # tini reaps zombies and forwards signals properly
+            "-w",
+            "/work",
+            "-v",
+            f"{work_dir.absolute()}:/work",
+        ]
+        # Mount custom force fields (e.g. charmm36m) so GROMACS can find them
+        ff_dir = Path(__file__).parents[2] / "data" / "forcefields"
+        if ff_dir.is_dir():
+            docker_prefix += [
+                "-v", f"{ff_dir.absolute()}:/ff_extra:ro",
+                "-e", "GMXLIB=/ff_extra",
             ]
-            # Mount custom force fields (e.g. charmm36m) so GROMACS can find them
-            ff_dir = Path(__file__).parents[2] / "data" / "forcefields"
-            if ff_dir.is_dir():
-                docker_prefix += [
-                    "-v", f"{ff_dir.resolve()}:/ff_extra:ro",
-                    "-e", "GMXLIB=/ff_extra",
-                ]
-            if gpu_id:
-                docker_prefix += ["--gpus", f"device={gpu_id}"]
-            return docker_prefix + [self._docker_image, self.gmx] + gmx_args
-        return [self.gmx] + gmx_args
+        if gpu_id:
+            docker_prefix += ["--gpus", f"device={gpu_id}"]
+        return docker_prefix + [self._docker_image]
 
     def _run(
         self,
@@ -91,17 +319,7 @@ class GROMACSRunner:
         timeout: int | None = None,
     ) -> GMXResult:
         """Run a blocking gmx subcommand."""
-        cmd = self._build_cmd(args, self.work_dir)
-        proc = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE if stdin_text else None,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=str(self.work_dir),
-            text=True,
-        )
-        stdout, stderr = proc.communicate(input=stdin_text, timeout=timeout)
-        return GMXResult(proc.returncode, stdout, stderr)
+        return self._communicate([self.gmx] + args, self.work_dir, stdin_text, timeout)
 
     def _classify_grompp_output(self, result: GMXResult) -> GMXResult:
         """Distinguish grompp warnings (non-fatal) from errors (fatal)."""
@@ -120,12 +338,24 @@ class GROMACSRunner:
             # We can find it by matching the PID of the `docker run` process
             # to the container via `docker ps` filtering by the image.
             result = subprocess.run(
-                ["docker", "ps", "-q", "--filter", f"ancestor={self._docker_image}"],
+                [
+                    "docker",
+                    "ps",
+                    "--filter",
+                    f"ancestor={self._docker_image}",
+                    "--format",
+                    "{{.ID}} {{.Names}}",
+                ],
                 capture_output=True,
                 text=True,
                 timeout=5,
             )
-            containers = result.stdout.strip().splitlines()
+            # Warm exec containers share the image but never run mdrun
+            containers = [
+                line.split()[0]
+                for line in result.stdout.strip().splitlines()
+                if not line.split()[-1].startswith(_WARM_NAME_PREFIX)
+            ]
             if containers:
                 return containers[-1]  # most recent container for this image
         except Exception:
@@ -211,7 +441,7 @@ class GROMACSRunner:
         tpr_file: str,
         output_prefix: str,
         plumed_file: str | None = None,
-        n_cores: int = 1,
+        n_cores: int | None = None,
         gpu_id: str | None = None,
         append: bool = False,
         cpt_file: str | None = None,
@@ -225,6 +455,13 @@ class GROMACSRunner:
         When *cpt_file* is provided the run resumes from that checkpoint.
         ``-append`` is added automatically so output files are continued
         rather than restarted with part suffixes.
+
+        Runs as one thread-MPI rank with *n_cores* OpenMP threads (default:
+        every core available to this process, at most 64, unpinned), rather
+        than leaving the split to GROMACS' detection, which is often wrong
+        inside containers. With
+        *gpu_id* the non-bonded kernels are forced onto that GPU, so a broken
+        GPU setup fails loudly instead of silently running on the CPU.
         """
         # Validate required files exist
         tpr_path = self.work_dir / tpr_file
@@ -244,12 +481,21 @@ class GROMACSRunner:
             "-deffnm",
             output_prefix,
             "-ntomp",
-            str(n_cores),
+            str(n_cores or min(_available_cores(), _MAX_OMP_THREADS)),
         ]
+        if not n_cores and "-pin" not in (extra_flags or []):
+            # Using every hardware thread makes `-pin auto` pin from core 0, so
+            # concurrent runs (one per web session) would share the same cores.
+            args += ["-pin", "off"]
+        if not Path(self.gmx).name.endswith("_mpi"):  # -ntmpi is thread-MPI only
+            args += ["-ntmpi", "1"]
         if plumed_file:
             args += ["-plumed", plumed_file]
         if gpu_id:
-            args += ["-gpu_id", gpu_id]
+            # `--gpus device=N` exposes only that GPU, renumbered to 0 in the container.
+            # PME, bonded and update stay on auto: forcing them fails for cut-off
+            # systems and for PLUMED runs, whose bias forces are applied on the CPU.
+            args += ["-gpu_id", "0" if self._docker_image else gpu_id, "-nb", "gpu"]
         if cpt_file:
             args += ["-cpi", cpt_file, "-append"]
         elif append:
@@ -258,7 +504,7 @@ class GROMACSRunner:
             args.extend(extra_flags)
 
         self._mdrun_proc = subprocess.Popen(
-            self._build_cmd(args, self.work_dir, gpu_id=gpu_id),
+            self._build_cmd(args, self.work_dir, gpu_id=gpu_id, warm=False),
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,  # merge stderr into stdout for live tailing
             cwd=str(self.work_dir),
@@ -305,18 +551,47 @@ class GROMACSRunner:
         work_dir: str = ".",
     ) -> dict[str, Any]:
         """Run an arbitrary gmx analysis subcommand (blocking)."""
+        argv = [self.gmx, subcommand] + args
+        return self._communicate(argv, Path(work_dir), stdin_text).to_dict()
+
+    def run_gmx_pipeline(self, steps: list[list[str]], work_dir: str = ".") -> dict[str, Any]:
+        """Run gmx subcommands in order, stopping at the first failure (blocking).
+
+        Each step is ``[subcommand, *args]``. Under Docker the whole chain runs
+        in a single container, so start-up is paid once instead of per step.
+        ``failed_step`` is the index of the failing step (None on success). A
+        trailing ``grompp`` step is classified like :meth:`grompp`.
+        """
         wd = Path(work_dir)
-        cmd = self._build_cmd([subcommand] + args, wd)
-        proc = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE if stdin_text else None,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=str(wd),
-            text=True,
-        )
-        stdout, stderr = proc.communicate(input=stdin_text)
-        return GMXResult(proc.returncode, stdout, stderr).to_dict()
+        if self._docker_image:
+            # `|| exit i+1` lets the exit status identify the failing step
+            script = "\n".join(
+                f"{shlex.join([self.gmx, *step])} || exit {i + 1}" for i, step in enumerate(steps)
+            )
+            result = self._communicate(["sh", "-c", script], wd)
+            failed = result.returncode - 1 if 0 < result.returncode <= len(steps) else None
+        else:
+            result = GMXResult(0, "", "")
+            failed = None
+            for i, step in enumerate(steps):
+                proc = subprocess.Popen(
+                    self._build_cmd(step, wd),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=str(wd),
+                    text=True,
+                )
+                stdout, stderr = proc.communicate()
+                result.stdout += stdout
+                result.stderr += stderr
+                if proc.returncode != 0:
+                    result.returncode, failed = proc.returncode, i
+                    break
+        if failed is None and steps and steps[-1][0] == "grompp":
+            result = self._classify_grompp_output(result)
+            if not result.success:
+                failed = len(steps) - 1
+        return {**result.to_dict(), "failed_step": failed}
 
     def convert_tpr(
         self,
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import os
 import re
+import shutil
+import tempfile
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
+import orjson
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from md_agent.config.schemas import ExtractedPaperSettings, validate_extracted_settings
 from md_agent.utils.parsers import normalize_extracted_settings
 
 # ── Semantic Scholar ───────────────────────────────────────────────────
@@ -27,13 +36,47 @@ _DEFAULT_FIELDS = [
 ]
 
 
+_POOL_CONNECTIONS = 8
+_POOL_MAXSIZE = 16
+_COPY_CHUNK = 1 << 20
+_DOWNLOAD_WORKERS = 8  # must not exceed _POOL_MAXSIZE
+_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+)
+
+
 class PaperRetriever:
-    """Retrieves papers from Semantic Scholar and ArXiv."""
+    """Retrieves papers from Semantic Scholar and ArXiv.
+
+    All HTTP traffic goes through one pooled ``requests.Session`` so repeated
+    calls to the same host reuse keep-alive connections. Call :meth:`close`
+    (or use the retriever as a context manager) to release them.
+    """
 
     def __init__(self, s2_api_key: str | None = None) -> None:
         self._s2_headers = {"x-api-key": s2_api_key} if s2_api_key else {}
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=_RETRY,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._session.close()
+
+    def __enter__(self) -> PaperRetriever:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def search_semantic_scholar(
         self,
         query: str,
@@ -42,16 +85,12 @@ class PaperRetriever:
     ) -> dict[str, Any]:
         """Search Semantic Scholar for papers matching a query."""
         fields = fields or _DEFAULT_FIELDS
-        resp = requests.get(
+        resp = self._session.get(
             f"{_S2_BASE}/paper/search",
             params={"query": query, "limit": max_results, "fields": ",".join(fields)},
             headers=self._s2_headers,
             timeout=30,
         )
-        if resp.status_code == 429:
-            retry_after = int(resp.headers.get("Retry-After", 5))
-            time.sleep(retry_after)
-            resp.raise_for_status()
         resp.raise_for_status()
         data = resp.json().get("data", [])
         # Simplify: flatten openAccessPdf
@@ -82,69 +121,66 @@ class PaperRetriever:
             "categories": paper.categories,
         }
 
+    def stream_pdf(self, url: str, fh: BinaryIO) -> int:
+        """Stream a PDF from *url* into the binary file object *fh*; return bytes written."""
+        start = fh.tell()
+        with self._session.get(url, timeout=60, stream=True) as resp:
+            resp.raise_for_status()
+            # Copy straight off the socket in 1 MiB reads; undo any gzip transfer-encoding.
+            resp.raw.decode_content = True
+            shutil.copyfileobj(resp.raw, fh, length=_COPY_CHUNK)
+        return fh.tell() - start
+
     def download_pdf(self, url: str, output_path: str) -> dict[str, Any]:
         """Download a PDF from a URL to a local path."""
         try:
-            resp = requests.get(url, timeout=60, stream=True)
-            resp.raise_for_status()
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, "wb") as fh:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    fh.write(chunk)
-            size_kb = Path(output_path).stat().st_size // 1024
-            return {"output_path": output_path, "size_kb": size_kb}
+                total = self.stream_pdf(url, fh)
+            return {"output_path": output_path, "size_kb": total // 1024}
         except Exception as exc:
             return {"error": str(exc)}
 
+    def download_pdfs(self, urls_and_paths: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """Download several PDFs concurrently over the pooled session.
+
+        Returns one :meth:`download_pdf` result dict per ``(url, output_path)``
+        pair, in input order.
+        """
+        if not urls_and_paths:
+            return []
+        workers = min(_DOWNLOAD_WORKERS, len(urls_and_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda pair: self.download_pdf(*pair), urls_and_paths))
+
     def extract_text_from_pdf(
         self,
-        pdf_path: str,
+        pdf_path: str | BinaryIO,
         pages: list[int] | None = None,
         max_chars: int = 50000,
     ) -> dict[str, Any]:
-        """Extract readable text from a PDF using pdfplumber.
+        """Extract readable text from a PDF.
+
+        Uses PyMuPDF (``fitz``) when installed — its native extractor is far
+        faster than pdfminer — and falls back to pdfplumber otherwise.
+        *pdf_path* may also be an open binary file object (e.g. ``io.BytesIO``),
+        so downloaded papers can be parsed without touching disk.
 
         Heuristic: finds the Methods/Simulation section and starts extraction there.
         """
-        try:
-            import pdfplumber  # type: ignore
-        except ImportError:
-            return {"error": "pdfplumber not installed. Run: pip install pdfplumber"}
-
-        if not Path(pdf_path).exists():
+        if isinstance(pdf_path, str) and not Path(pdf_path).exists():
             return {"error": f"PDF not found: {pdf_path}"}
 
-        text_parts: list[str] = []
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                page_list = (
-                    [pdf.pages[i] for i in pages if i < len(pdf.pages)] if pages else pdf.pages
-                )
-                for page in page_list:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text_parts.append(extracted)
+            text_parts = _read_through_methods(_iter_page_texts(pdf_path, pages), max_chars)
+        except ImportError:
+            return {"error": "pdfplumber not installed. Run: pip install pdfplumber"}
         except Exception as exc:
             return {"error": f"PDF extraction failed: {exc}"}
 
         full_text = "\n".join(text_parts)
         # Heuristic: find Methods section
-        methods_markers = [
-            "methods",
-            "simulation details",
-            "computational details",
-            "simulation protocol",
-            "molecular dynamics simulation",
-            "simulation setup",
-            "computational methods",
-        ]
-        lower = full_text.lower()
-        best_start = 0
-        for marker in methods_markers:
-            idx = lower.find(marker)
-            if idx > 0:
-                best_start = max(0, idx - 200)
-                break
+        best_start = _methods_start(full_text)
 
         excerpt = full_text[best_start : best_start + max_chars]
         return {
@@ -155,6 +191,105 @@ class PaperRetriever:
         }
 
 
+# Section headings tried in priority order; the first one found wins.
+_METHODS_MARKERS = (
+    "methods",
+    "simulation details",
+    "computational details",
+    "simulation protocol",
+    "molecular dynamics simulation",
+    "simulation setup",
+    "computational methods",
+)
+
+# One pass over the text finds every marker occurrence. The lookahead keeps
+# matches zero-width, so "methods" inside "computational methods" still counts.
+# Matching ignores case, so the text never needs a lowercased copy.
+_METHODS_RE = re.compile("(?=(" + "|".join(map(re.escape, _METHODS_MARKERS)) + "))", re.IGNORECASE)
+_PRIMARY_RE = re.compile(re.escape(_METHODS_MARKERS[0]), re.IGNORECASE)
+
+
+def _methods_start(text: str) -> int:
+    """Return the excerpt start: 200 chars before the best marker, else 0.
+
+    Markers keep their priority order; a marker whose first occurrence is at
+    offset 0 is ignored, as is any later occurrence of it.
+    """
+    first: dict[str, int] = {}
+    for match in _METHODS_RE.finditer(text):
+        marker = match.group(1).lower()
+        if marker in first:
+            continue
+        first[marker] = match.start()
+        if marker == _METHODS_MARKERS[0] and match.start() > 0:
+            break  # top priority found — nothing later can outrank it
+    for marker in _METHODS_MARKERS:
+        idx = first.get(marker, 0)
+        if idx > 0:
+            return max(0, idx - 200)
+    return 0
+
+
+def _read_through_methods(page_texts: Iterator[str], max_chars: int) -> list[str]:
+    """Collect non-empty page texts, stopping once the excerpt window is covered.
+
+    Only the top-priority marker can fix the window early: as soon as its first
+    occurrence (past offset 0) is seen and ``max_chars`` more characters have
+    been read, the remaining pages would be cut from the excerpt anyway, so
+    they are never parsed. Otherwise every page is read, as before.
+    """
+    parts: list[str] = []
+    length = 0  # len("\n".join(parts))
+    stop_at: int | None = None
+    primary_seen = False
+    for text in page_texts:
+        if not text:
+            continue
+        offset = length + 1 if parts else 0
+        parts.append(text)
+        length = offset + len(text)
+        if not primary_seen:
+            match = _PRIMARY_RE.search(text)
+            if match:
+                primary_seen = True
+                idx = match.start()
+                if offset + idx > 0:
+                    stop_at = max(0, offset + idx - 200) + max_chars
+        if stop_at is not None and length >= stop_at:
+            break
+    return parts
+
+
+def _iter_page_texts(pdf_path: str | BinaryIO, pages: list[int] | None) -> Iterator[str]:
+    """Yield the text of each selected page, preferring PyMuPDF over pdfplumber."""
+    try:
+        import fitz  # type: ignore
+    except ImportError:
+        fitz = None
+
+    if fitz is not None:
+        if isinstance(pdf_path, str):
+            doc = fitz.open(pdf_path)
+        else:
+            doc = fitz.open(stream=pdf_path.read(), filetype="pdf")
+        with doc:
+            page_list = [doc[i] for i in pages if i < len(doc)] if pages else doc
+            for page in page_list:
+                yield page.get_text("text").rstrip()
+        return
+
+    import pdfplumber  # type: ignore
+
+    # No laparams: pdfminer's layout analysis (boxes, columns, reading order)
+    # only matters for layout-aware output, not for finding the Methods section.
+    with pdfplumber.open(pdf_path, laparams=None) as pdf:
+        page_list = [pdf.pages[i] for i in pages if i < len(pdf.pages)] if pages else pdf.pages
+        for page in page_list:
+            # Line-clustered chars only; skips the word segmentation extract_text does.
+            yield page.extract_text_simple() or ""
+            page.close()  # drop the page's cached char objects
+
+
 # ── MD settings extraction via Claude ─────────────────────────────────
 
 _EXTRACTION_PROMPT = """\
@@ -164,7 +299,7 @@ parameters from the paper text below.
 Paper title: {title}
 Expected method (if known): {method_hint}
 
-Return ONLY a valid JSON object with exactly this structure (use null for missing values):
+Call the extract_md_settings tool with exactly this structure (use null for missing values):
 {{
   "method": "metadynamics|umbrella|steered|plain",
   "gromacs": {{
@@ -217,11 +352,58 @@ Paper text:
 """
 
 
+_EXTRACTION_MODEL = "claude-opus-4-6"
+# Bump when _EXTRACTION_PROMPT or response parsing changes, to invalidate cached results.
+_EXTRACTION_PROMPT_VERSION = "v2"
+_EXTRACTION_MAX_RETRIES = 2
+_EXTRACTION_TOOL = {
+    "name": "extract_md_settings",
+    "description": "Record the MD simulation parameters extracted from the paper.",
+    "input_schema": ExtractedPaperSettings.model_json_schema(),
+}
+
+
+def _read_cached_settings(path: Path) -> dict[str, Any] | None:
+    """Return the raw (pre-normalization) settings cached at *path*, or None on a miss."""
+    try:
+        return orjson.loads(path.read_bytes())["settings"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_settings(path: Path, settings: dict[str, Any]) -> None:
+    """Atomically store raw *settings* at *path*; cache write failures are ignored."""
+    payload = {
+        "provider": "anthropic",
+        "model": _EXTRACTION_MODEL,
+        "prompt_version": _EXTRACTION_PROMPT_VERSION,
+        "created": time.time(),
+        "settings": settings,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(orjson.dumps(payload))
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+
+
 class MDSettingsExtractor:
-    """Extracts structured MD parameters from paper text via a nested Claude call."""
+    """Extracts structured MD parameters from paper text via a nested Claude call.
+
+    With *cache_dir* set, successful extractions are stored there as JSON keyed
+    by a hash of the model, prompt version and inputs, so re-running on the
+    same paper skips the Claude call entirely.
+    """
 
-    def __init__(self, anthropic_client: Any) -> None:
+    def __init__(self, anthropic_client: Any, cache_dir: str | None = None) -> None:
         self._client = anthropic_client
+        self._cache_dir = Path(cache_dir) if cache_dir else None
 
     def extract_md_settings_from_text(
         self,
@@ -233,40 +415,80 @@ class MDSettingsExtractor:
 
         Returns a structured dict matching ExtractedPaperSettings schema.
         """
+        text = paper_text[:40000]  # stay well within context window
+        cache_path = self._cache_path(text, paper_title, method_hint)
+        if cache_path is not None:
+            cached = _read_cached_settings(cache_path)
+            if cached is not None:
+                return normalize_extracted_settings(cached)
+
         prompt = _EXTRACTION_PROMPT.format(
             title=paper_title or "Unknown",
             method_hint=method_hint or "auto-detect",
-            text=paper_text[:40000],  # stay well within context window
+            text=text,
         )
 
-        try:
-            response = self._client.messages.create(
-                model="claude-opus-4-6",
-                max_tokens=4096,
-                messages=[{"role": "user", "content": prompt}],
-            )
-        except Exception as exc:
-            return {"error": f"Claude API call failed: {exc}"}
-
-        raw_text = "".join(block.text for block in response.content if hasattr(block, "text"))
+        messages: list[dict[str, Any]] = [{"role": "user", "content": prompt}]
+        for attempt in range(_EXTRACTION_MAX_RETRIES + 1):
+            try:
+                response = self._client.messages.create(
+                    model=_EXTRACTION_MODEL,
+                    max_tokens=4096,
+                    tools=[_EXTRACTION_TOOL],
+                    tool_choice={"type": "tool", "name": _EXTRACTION_TOOL["name"]},
+                    messages=messages,
+                )
+            except Exception as exc:
+                return {"error": f"Claude API call failed: {exc}"}
 
-        # Extract JSON from response (may be wrapped in markdown code block)
-        json_match = re.search(r"\{.*\}", raw_text, re.DOTALL)
-        if not json_match:
-            return {
-                "error": "No JSON found in extraction response",
-                "raw_response": raw_text[:2000],
-            }
+            call = next((b for b in response.content if b.type == "tool_use"), None)
+            if call is None:
+                return {"error": "No extract_md_settings call in extraction response"}
 
-        try:
-            settings = json.loads(json_match.group())
-        except json.JSONDecodeError as exc:
-            return {"error": f"JSON parse error: {exc}", "raw_response": raw_text[:2000]}
+            settings = dict(call.input)
+            is_valid, errors = validate_extracted_settings(settings)
+            if is_valid or attempt == _EXTRACTION_MAX_RETRIES:
+                break
+            # Feed the validation errors back and let Claude correct its answer.
+            messages += [
+                {"role": "assistant", "content": response.content},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": call.id,
+                            "is_error": True,
+                            "content": f"Validation failed: {'; '.join(errors)}. "
+                            "Call extract_md_settings again with corrected values.",
+                        }
+                    ],
+                },
+            ]
+
+        if cache_path is not None and is_valid:
+            _write_cached_settings(cache_path, settings)
 
         # Apply unit normalization
         settings = normalize_extracted_settings(settings)
         return settings
 
+    def _cache_path(self, text: str, title: str, method_hint: str | None) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        key = hashlib.sha256(
+            b"|".join(
+                [
+                    _EXTRACTION_MODEL.encode(),
+                    _EXTRACTION_PROMPT_VERSION.encode(),
+                    text.encode(),
+                    (title or "").encode(),
+                    (method_hint or "").encode(),
+                ]
+            )
+        ).hexdigest()
+        return self._cache_dir / f"{key}.json"
+
     def create_config_from_extracted_settings(
         self,
         settings: dict[str, Any],
@@ -281,10 +503,6 @@ class MDSettingsExtractor:
           {output_dir}/{config_name}/method.yaml       — method-specific params
           {output_dir}/{config_name}/cvs.yaml          — collective variables
         """
-        from omegaconf import OmegaConf
-
-        from md_agent.config.schemas import validate_extracted_settings
-
         is_valid, errors = validate_extracted_settings(settings)
         output = Path(output_dir) / config_name
         output.mkdir(parents=True, exist_ok=True)
@@ -292,9 +510,13 @@ class MDSettingsExtractor:
         saved_files: list[str] = []
 
         def _save(name: str, data: dict) -> None:
-            path = str(output / name)
-            (output / name).write_text(OmegaConf.to_yaml(OmegaConf.create(data)))
-            saved_files.append(path)
+            # Plain dicts need no OmegaConf round-trip; write-then-rename so an
+            # interrupted run never leaves a half-written config behind.
+            path = output / name
+            tmp = output / f"{name}.tmp"
+            tmp.write_text(yaml.safe_dump(data, sort_keys=False, allow_unicode=True))
+            os.replace(tmp, path)
+            saved_files.append(str(path))
 
         # Gromacs params
         if settings.get("gromacs"):
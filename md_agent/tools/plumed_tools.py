@@ -10,24 +10,23 @@ from jinja2 import Environment, FileSystemLoader, StrictUndefined
 
 _TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates" / "plumed"
 
-
-def _make_env() -> Environment:
-    return Environment(
-        loader=FileSystemLoader(str(_TEMPLATE_DIR)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-        undefined=StrictUndefined,
-    )
+# One environment per process. Templates are never re-stat'ed and, once
+# compiled, stay cached (no LRU eviction).
+_ENV = Environment(
+    loader=FileSystemLoader(str(_TEMPLATE_DIR)),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=-1,
+)
 
 
 class PlumedGenerator:
     """Generates PLUMED input (.dat) files from Hydra config parameters."""
 
-    def __init__(self) -> None:
-        self._env = _make_env()
-
     def _render(self, template_name: str, context: dict[str, Any], output_path: str) -> str:
-        template = self._env.get_template(template_name)
+        template = _ENV.get_template(template_name)
         content = template.render(**context)
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         Path(output_path).write_text(content)
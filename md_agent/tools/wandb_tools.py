@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 import threading
 from pathlib import Path
 from typing import Any
@@ -9,15 +10,21 @@ from typing import Any
 import wandb
 
 from md_agent.utils.parsers import (
-    count_hills,
+    EdrHeader,
+    count_new_hills,
     get_file_mtime,
-    parse_colvar_file,
+    parse_colvar_columns,
+    parse_colvar_tail,
     parse_edr_with_pyedr,
-    parse_gromacs_log_progress,
+    parse_gromacs_log_tail,
 )
 
 # ── Background monitor ─────────────────────────────────────────────────
 
+# With file-change events, a slow timer still polls in case an event is missed.
+_BACKSTOP_INTERVAL_S = 300.0
+_EVENT_SETTLE_S = 1.0
+
 
 class MDMonitor:
     """Daemon thread that periodically tails MD output files and logs to wandb.
@@ -27,6 +34,9 @@ class MDMonitor:
     Design principles:
     - daemon=True: never prevents interpreter exit
     - Never raises inside the poll loop (logs exceptions as metrics)
+    - With ``watchdog`` installed, polls are driven by file-change events
+      (inotify/kqueue/...), with a slow backstop timer; otherwise it polls
+      every ``poll_interval_s``
     - Uses file mtime guards to skip unchanged files
     - Bookmarks last-seen step/line to avoid double-logging
     """
@@ -51,11 +61,20 @@ class MDMonitor:
 
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
+        # Set by the watchdog observer thread; only ever wakes the monitor loop,
+        # so all parsing and bookmark state stays on the monitor thread.
+        self._changed = threading.Event()
+        self._observer: Any = None
 
         # Bookmarks
         self._last_edr_step: int = 0
-        self._last_colvar_line: int = 0
+        self._last_edr_offset: int = 0  # byte offset just past the last decoded frame
+        self._edr_header: EdrHeader | None = None  # decoded once, reused every poll
+        self._last_colvar_offset: int = 0  # byte offsets past the last complete line
+        self._colvar_fields: list[str] | None = None
+        self._last_hills_offset: int = 0
         self._last_hills_count: int = 0
+        self._last_log_offset: int = 0
 
         # mtime guards
         self._edr_mtime: float = 0.0
@@ -66,6 +85,7 @@ class MDMonitor:
         if wandb.run is None:
             raise RuntimeError("wandb.init() must be called before MDMonitor.start()")
         self._stop_event.clear()
+        self._observer = self._start_observer()
         self._thread = threading.Thread(
             target=self._monitor_loop,
             daemon=True,
@@ -76,9 +96,15 @@ class MDMonitor:
     def stop(self, final_flush: bool = True) -> None:
         """Signal the monitor to stop and optionally do a final log flush."""
         self._stop_event.set()
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=10)
+            self._observer = None
         if self._thread:
             self._thread.join(timeout=60)
         if final_flush:
+            get_file_mtime.cache_clear()  # the last poll may be < 100 ms old
             self._do_poll()
 
     def _monitor_loop(self) -> None:
@@ -90,30 +116,86 @@ class MDMonitor:
                     wandb.log({"monitor_error": str(exc)})
                 except Exception:
                     pass
+            self._wait_for_change()
+
+    def _wait_for_change(self) -> None:
+        if self._observer is None:
             self._stop_event.wait(timeout=self.poll_interval)
+            return
+        self._changed.wait(timeout=max(self.poll_interval, _BACKSTOP_INTERVAL_S))
+        self._changed.clear()
+        # mdrun writes in bursts; give the rest of the burst a moment to land.
+        self._stop_event.wait(timeout=_EVENT_SETTLE_S)
+
+    def _start_observer(self) -> Any:
+        """Watch the output files' directories; return None to fall back to polling."""
+        try:
+            from watchdog.events import FileSystemEventHandler  # type: ignore
+            from watchdog.observers import Observer  # type: ignore
+        except ImportError:
+            return None
+
+        watched = {
+            os.path.abspath(f)
+            for f in (self.log_file, self.edr_file, self.colvar_file, self.hills_file)
+            if f
+        }
+        changed = self._changed
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event: Any) -> None:
+                paths = (event.src_path, getattr(event, "dest_path", ""))
+                if any(os.path.abspath(p) in watched for p in paths if p):
+                    changed.set()
+
+        observer = Observer()
+        try:
+            for directory in {os.path.dirname(f) for f in watched}:
+                observer.schedule(_Handler(), directory, recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception:
+            return None
+        return observer
 
     def _do_poll(self) -> None:
-        self._poll_edr()
-        self._poll_colvar()
-        self._poll_hills()
-        self._poll_log_progress()
-
-    def _poll_edr(self) -> None:
+        # Rows from every file are gathered first and sent as one wandb.log per
+        # distinct md_step (EDR and COLVAR rows at the same step share a call),
+        # plus one call for the run-level counters. Two COLVAR rows that map to
+        # the same step still get a call each. The keys arrive as two
+        # already-ordered runs (EDR, then COLVAR), which timsort merges in O(n).
+        by_step: dict[int, list[dict[str, Any]]] = {}
+        self._poll_edr(by_step)
+        self._poll_colvar(by_step)
+        for step in sorted(by_step):
+            for metrics in by_step[step]:
+                wandb.log({"md_step": step, **metrics})
+
+        counters: dict[str, Any] = {}
+        self._poll_hills(counters)
+        self._poll_log_progress(counters)
+        if counters:
+            wandb.log(counters)
+
+    def _poll_edr(self, by_step: dict[int, list[dict[str, Any]]]) -> None:
         mtime = get_file_mtime(self.edr_file)
         if mtime <= self._edr_mtime:
             return
         self._edr_mtime = mtime
 
-        data = parse_edr_with_pyedr(
+        data, self._last_edr_offset, self._edr_header = parse_edr_with_pyedr(
             self.edr_file,
             terms=self.energy_terms,
             from_step=self._last_edr_step,
+            from_offset=self._last_edr_offset,
+            header_cache=self._edr_header,
         )
-        for step, metrics in sorted(data.items()):
-            wandb.log({"md_step": step, **metrics})
-            self._last_edr_step = max(self._last_edr_step, step)
+        for step, metrics in data:
+            by_step.setdefault(step, [{}])[0].update(metrics)
+        if data:
+            self._last_edr_step = max(self._last_edr_step, data[-1][0])
 
-    def _poll_colvar(self) -> None:
+    def _poll_colvar(self, by_step: dict[int, list[dict[str, Any]]]) -> None:
         if not self.colvar_file:
             return
         mtime = get_file_mtime(self.colvar_file)
@@ -121,15 +203,21 @@ class MDMonitor:
             return
         self._colvar_mtime = mtime
 
-        rows = parse_colvar_file(self.colvar_file, from_line=self._last_colvar_line)
+        rows, self._last_colvar_offset, self._colvar_fields = parse_colvar_tail(
+            self.colvar_file,
+            from_offset=self._last_colvar_offset,
+            fields=self._colvar_fields,
+        )
         for row in rows:
             time_ps = row.get("time", 0.0)
-            step = int(time_ps / self.dt)
+            step = round(time_ps / self.dt)  # int() would floor 42.99999 to 42
             cv_data = {k: v for k, v in row.items() if k != "time"}
-            wandb.log({"md_step": step, "time_ps": time_ps, **cv_data})
-        self._last_colvar_line += len(rows)
+            at_step = by_step.setdefault(step, [{}])
+            if "time_ps" in at_step[-1]:
+                at_step.append({})  # never overwrite another COLVAR row
+            at_step[-1].update(time_ps=time_ps, **cv_data)
 
-    def _poll_hills(self) -> None:
+    def _poll_hills(self, counters: dict[str, Any]) -> None:
         if not self.hills_file:
             return
         mtime = get_file_mtime(self.hills_file)
@@ -137,15 +225,18 @@ class MDMonitor:
             return
         self._hills_mtime = mtime
 
-        total = count_hills(self.hills_file)
-        if total > self._last_hills_count:
-            wandb.log({"hills_deposited": total})
-            self._last_hills_count = total
+        prev_offset = self._last_hills_offset
+        new, self._last_hills_offset = count_new_hills(self.hills_file, from_offset=prev_offset)
+        if self._last_hills_offset < prev_offset:
+            self._last_hills_count = 0  # HILLS was replaced; count afresh
+        if new:
+            self._last_hills_count += new
+            counters["hills_deposited"] = self._last_hills_count
 
-    def _poll_log_progress(self) -> None:
-        info = parse_gromacs_log_progress(self.log_file)
+    def _poll_log_progress(self, counters: dict[str, Any]) -> None:
+        info, self._last_log_offset = parse_gromacs_log_tail(self.log_file, self._last_log_offset)
         if info and info.get("ns_per_day") is not None:
-            wandb.log({"ns_per_day": info["ns_per_day"]})
+            counters["ns_per_day"] = info["ns_per_day"]
 
 
 # ── Singleton monitor handle ───────────────────────────────────────────
@@ -196,14 +287,23 @@ def wandb_log_from_edr(
     edr_file: str,
     energy_terms: list[str],
     step_offset: int = 0,
+    byte_offset: int = 0,
 ) -> dict[str, Any]:
-    """Parse an .edr file and log all energy terms to wandb (explicit call)."""
-    data = parse_edr_with_pyedr(edr_file, terms=energy_terms, from_step=step_offset)
-    logged = 0
-    for step, metrics in sorted(data.items()):
+    """Parse an .edr file and log all energy terms to wandb (explicit call).
+
+    Pass the returned ``next_byte_offset`` back as *byte_offset* on a later
+    call to decode only the frames written since.
+    """
+    data, next_offset, _ = parse_edr_with_pyedr(
+        edr_file, terms=energy_terms, from_step=step_offset, from_offset=byte_offset
+    )
+    for step, metrics in data:
         wandb.log({"md_step": step, **metrics})
-        logged += 1
-    return {"logged_steps": logged, "last_step": max(data.keys(), default=step_offset)}
+    return {
+        "logged_steps": len(data),
+        "last_step": data[-1][0] if data else step_offset,
+        "next_byte_offset": next_offset,
+    }
 
 
 def wandb_log_colvar(
@@ -213,15 +313,20 @@ def wandb_log_colvar(
     dt: float = 0.002,
 ) -> dict[str, Any]:
     """Parse a PLUMED COLVAR file and log all CV values to wandb."""
-    rows = parse_colvar_file(colvar_file, from_line=from_step)
-    logged = 0
-    for row in rows:
-        time_ps = row.get(step_col, 0.0)
-        step = int(time_ps / dt)
-        cv_data = {k: v for k, v in row.items() if k != step_col}
-        wandb.log({"md_step": step, "time_ps": time_ps, **cv_data})
-        logged += 1
-    return {"logged_rows": logged}
+    # Column-first: each row becomes exactly one dict, the one handed to wandb.
+    columns = parse_colvar_columns(colvar_file, from_line=from_step)
+    if not columns:
+        return {"logged_rows": 0}
+    n_rows = len(next(iter(columns.values())))
+    time_col = columns.pop(step_col, None)
+    times = time_col.tolist() if time_col is not None else [0.0] * n_rows
+    cv_columns = [(name, col.tolist()) for name, col in columns.items()]
+    for i, time_ps in enumerate(times):
+        record = {"md_step": round(time_ps / dt), "time_ps": time_ps}
+        for name, values in cv_columns:
+            record[name] = values[i]
+        wandb.log(record)
+    return {"logged_rows": n_rows}
 
 
 def wandb_start_background_monitor(
@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from collections.abc import Iterable
+from fnmatch import fnmatch
+from itertools import islice
 from pathlib import Path
 
 
@@ -20,16 +25,16 @@ def read_file(
     path = Path(file_path)
     if not path.exists():
         return f"[Error] File not found: {file_path}"
+    # Stream the file so only max_lines lines are ever held in memory.
     try:
-        lines = path.read_text(errors="replace").splitlines()
+        with path.open(errors="replace") as fh:
+            if tail:
+                lines: Iterable[str] = deque(fh, maxlen=max_lines)
+            else:
+                lines = list(islice(fh, max_lines))
     except Exception as exc:
         return f"[Error] Could not read {file_path}: {exc}"
-
-    if tail:
-        lines = lines[-max_lines:]
-    else:
-        lines = lines[:max_lines]
-    return "\n".join(lines)
+    return "".join(lines).removesuffix("\n")
 
 
 def list_files(
@@ -41,9 +46,25 @@ def list_files(
     base = Path(directory)
     if not base.exists():
         return []
-    glob_pattern = f"**/{pattern}" if recursive else pattern
-    matched = sorted(str(p) for p in base.glob(glob_pattern) if p.is_file())
-    return matched
+    if "/" in pattern or os.sep in pattern or "**" in pattern:
+        glob_pattern = f"**/{pattern}" if recursive else pattern
+        return sorted(str(p) for p in base.glob(glob_pattern) if p.is_file())
+
+    # Plain name patterns: DirEntry.is_file() reuses the d_type from the
+    # directory listing, so no per-file stat() is needed.
+    matched: list[str] = []
+    stack = [str(base)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if recursive and entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif fnmatch(entry.name, pattern) and entry.is_file():
+                        matched.append(str(Path(entry.path)))  # same form as glob
+        except OSError:
+            continue
+    return sorted(matched)
 
 
 def ensure_dir(path: str) -> str:
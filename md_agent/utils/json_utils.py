@@ -0,0 +1,30 @@
+"""Fast JSON encoding for tool results."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    # orjson only handles C-contiguous arrays natively; strided views
+    # (e.g. ``arr[::step]``) land here and are converted as lists.
+    tolist = getattr(obj, "tolist", None)
+    return tolist() if callable(tolist) else str(obj)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize *obj* to a JSON string, falling back to ``str()`` for unknown types.
+
+    Handles numpy scalars/arrays and non-string dict keys natively.
+    """
+    option = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    return orjson.dumps(obj, default=_default, option=option).decode()
+
+
+def dumpb(obj: Any) -> bytes:
+    """Like :func:`dumps` but returns UTF-8 bytes, e.g. for an HTTP response body."""
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import mmap
 import os
-from pathlib import Path
+import re
+import time
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 # ── Unit conversion ────────────────────────────────────────────────────
@@ -13,6 +18,7 @@ _ENERGY_FACTORS: dict[tuple[str, str], float] = {
     ("kj/mol", "kcal/mol"): 1 / 4.184,
     ("kcal", "kj"): 4.184,
     ("kj", "kcal"): 1 / 4.184,
+    ("kcal", "kj/mol"): 4.184,  # papers often write "kcal" for kcal/mol
 }
 
 _LENGTH_FACTORS: dict[tuple[str, str], float] = {
@@ -23,21 +29,65 @@ _LENGTH_FACTORS: dict[tuple[str, str], float] = {
     ("nm", "å"): 10.0,
 }
 
-_ALL_FACTORS = {**_ENERGY_FACTORS, **_LENGTH_FACTORS}
+# Harmonic restraint constants: kcal/mol/Å² → kJ/mol/nm² is 4.184 × 10² = 418.4
+_FORCE_CONSTANT_FACTORS: dict[tuple[str, str], float] = {
+    ("kcal/mol/å^2", "kj/mol/nm^2"): 4.184 * 100,
+    ("kcal/mol/a^2", "kj/mol/nm^2"): 4.184 * 100,
+}
 
+_ALL_FACTORS = {**_ENERGY_FACTORS, **_LENGTH_FACTORS, **_FORCE_CONSTANT_FACTORS}
 
-def convert_units(value: float, from_unit: str, to_unit: str) -> float:
-    """Convert a scalar value between supported unit pairs."""
+
+@lru_cache(maxsize=64)
+def _factor(from_unit: str, to_unit: str) -> float:
+    """Resolve the multiplicative factor for a unit pair (memoized per spelling)."""
     key = (from_unit.lower(), to_unit.lower())
     if key[0] == key[1]:
-        return value
+        return 1.0
     factor = _ALL_FACTORS.get(key)
     if factor is None:
         raise ValueError(
             f"Unsupported unit conversion: '{from_unit}' → '{to_unit}'. "
             f"Supported pairs: {list(_ALL_FACTORS.keys())}"
         )
-    return value * factor
+    return factor
+
+
+def convert_units(value: float, from_unit: str, to_unit: str) -> float:
+    """Convert a scalar value between supported unit pairs."""
+    return value * _factor(from_unit, to_unit)
+
+
+# (value field, unit field, GROMACS unit) for each unit-bearing PLUMED setting
+_NORMALIZATION_RULES: tuple[tuple[str, str, str], ...] = (
+    ("hills_height", "hills_height_unit", "kJ/mol"),
+    ("hills_sigma", "sigma_unit", "nm"),
+    ("force_constant", "force_constant_unit", "kJ/mol/nm^2"),
+)
+
+
+def _convert_field(plumed: dict[str, Any], field: str, unit_field: str, target: str) -> None:
+    """Convert ``plumed[field]`` (scalar or list) to *target*, dropping its unit field.
+
+    Unknown units are left as-is rather than rejected. Without a unit field
+    the value is already in *target* units and nothing is touched.
+    """
+    if unit_field not in plumed:
+        return
+    unit = plumed.pop(unit_field)
+    if field not in plumed:
+        return
+    try:
+        factor = _factor(unit, target)
+    except ValueError:
+        return
+    if factor == 1.0:
+        return
+    value = plumed[field]
+    if isinstance(value, list):
+        plumed[field] = [v * factor for v in value]
+    else:
+        plumed[field] = value * factor
 
 
 def normalize_extracted_settings(settings: dict[str, Any]) -> dict[str, Any]:
@@ -47,69 +97,129 @@ def normalize_extracted_settings(settings: dict[str, Any]) -> dict[str, Any]:
     Modifies and returns the settings dict in-place.
     """
     plumed = settings.get("plumed", {})
-
-    height_unit = plumed.pop("hills_height_unit", "kJ/mol")
-    if height_unit.lower() in ("kcal/mol", "kcal"):
-        if "hills_height" in plumed:
-            plumed["hills_height"] = convert_units(plumed["hills_height"], "kcal/mol", "kJ/mol")
-
-    sigma_unit = plumed.pop("sigma_unit", "nm")
-    if sigma_unit.lower() in ("angstrom", "å", "a"):
-        if "hills_sigma" in plumed:
-            plumed["hills_sigma"] = [convert_units(s, "Å", "nm") for s in plumed["hills_sigma"]]
-
-    # Force constant: kJ/mol/nm^2 is GROMACS default; kcal/mol/Å^2 also common
-    fc_unit = plumed.pop("force_constant_unit", "kJ/mol/nm^2")
-    if fc_unit.lower() in ("kcal/mol/a^2", "kcal/mol/å^2"):
-        for key in ("force_constant",):
-            if key in plumed:
-                # kcal/mol/Å^2 → kJ/mol/nm^2: multiply by 4.184 × 100 = 418.4
-                plumed[key] = plumed[key] * 418.4
-
     settings["plumed"] = plumed
+    if not any(k.endswith("_unit") for k in plumed):
+        return settings  # already GROMACS-native, the common case
+    for field, unit_field, target in _NORMALIZATION_RULES:
+        _convert_field(plumed, field, unit_field, target)
     return settings
 
 
 # ── EDR parsing ────────────────────────────────────────────────────────
 
 
+@dataclass
+class EdrHeader:
+    """Decoded .edr preamble, reusable across incremental parses of one file."""
+
+    edr: Any  # pyedr EDRFile primed with the term names and file version
+    header_end: int  # byte offset of the first frame
+    index: dict[str, int]  # term name -> column
+    file_id: tuple[int, int]  # (st_dev, st_ino), to notice a replaced file
+
+
 def parse_edr_with_pyedr(
     edr_path: str,
     terms: list[str],
     from_step: int = 0,
-) -> dict[int, dict[str, float]]:
-    """Parse a GROMACS .edr file using pyedr.
-
-    Returns {step: {term_name: value}} for all steps > from_step.
-    Silently returns empty dict if pyedr or the file is unavailable.
+    from_offset: int = 0,
+    header_cache: EdrHeader | None = None,
+) -> tuple[list[tuple[int, dict[str, float]]], int, EdrHeader | None]:
+    """Parse a GROMACS .edr file using pyedr's frame decoder.
+
+    Decoding starts at byte *from_offset* (0 means the first frame), so a
+    caller that feeds back the returned offset only decodes frames appended
+    since its previous call. Feeding back the returned *header_cache* as well
+    skips re-reading the energy-name preamble; it is re-read if the file was
+    replaced, which also restarts decoding at the first frame.
+
+    Returns ``([(step, {term_name: value}), ...], next_offset, header_cache)``
+    for all steps > from_step, in file (i.e. chronological) order, where
+    ``next_offset`` points just past the last complete frame. Silently returns
+    ``([], from_offset, header_cache)`` if pyedr or the file is unavailable.
     """
     try:
-        import pyedr  # type: ignore
+        from pyedr.pyedr import Frame, GMX_Unpacker  # type: ignore
     except ImportError:
-        return {}
-
-    if not Path(edr_path).exists():
-        return {}
+        return [], from_offset, header_cache
 
     try:
-        data = pyedr.edr_to_dict(edr_path)
+        with open(edr_path, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            file_id = (st.st_dev, st.st_ino)
+            header = header_cache
+            replaced = header is not None and (
+                header.file_id != file_id or st.st_size < from_offset
+            )
+            if header is None or replaced:
+                decoded = _read_edr_header(fh)
+                if decoded is None:
+                    return [], from_offset, None
+                edr, header_end = decoded
+                index = {nm.name: i for i, nm in enumerate(edr.nms)}
+                header = EdrHeader(edr, header_end, index, file_id)
+            edr = header.edr
+            # Version-1 files store running sums that are converted frame by
+            # frame, so they cannot be resumed mid-file; re-read them in full.
+            if replaced or edr.file_version == 1:
+                start = header.header_end
+            else:
+                start = max(from_offset, header.header_end)
+            fh.seek(start)
+            tail = fh.read()
     except Exception:
-        # File may be partially written; skip this poll cycle
-        return {}
-
-    step_arr = data.get("Step", [])
-    result: dict[int, dict[str, float]] = {}
-    for i, step in enumerate(step_arr):
-        step = int(step)
+        # Missing, unreadable or not (yet) an EDR file; skip this poll cycle
+        return [], from_offset, header_cache
+
+    edr.data = GMX_Unpacker(tail)
+    columns = [(term, header.index[term]) for term in terms if term in header.index]
+
+    result: list[tuple[int, dict[str, float]]] = []
+    consumed = 0
+    while consumed < len(tail):
+        edr.frame = Frame()
+        try:
+            edr.do_enx()
+        except Exception:
+            # Trailing frame still being written; resume from its start next time
+            break
+        consumed = edr.data.get_position()
+        frame = edr.frame
+        # The XDR unpacker already yields Python ints/floats; no per-value casts.
+        step = frame.step
         if step <= from_step:
             continue
-        metrics: dict[str, float] = {}
-        for term in terms:
-            if term in data:
-                metrics[term] = float(data[term][i])
+        ener, nre = frame.ener, frame.nre
+        metrics = {term: ener[i].e for term, i in columns if i < nre}
         if metrics:
-            result[step] = metrics
-    return result
+            result.append((step, metrics))
+    # Version-1 decoding mutates the header state, so it is never reused.
+    return result, start + consumed, None if edr.file_version == 1 else header
+
+
+def _read_edr_header(fh: Any) -> tuple[Any, int] | None:
+    """Decode the energy-name preamble of an open .edr file.
+
+    Returns ``(edr, header_end)`` — a pyedr ``EDRFile`` primed with the term
+    names and file version, and the byte offset of the first frame — or None
+    if the file is too short to hold its header yet.
+    """
+    from pyedr.pyedr import EDRFile, GMX_Unpacker  # type: ignore
+
+    size = 4096
+    while True:
+        fh.seek(0)
+        buf = fh.read(size)
+        edr = EDRFile.__new__(EDRFile)  # skip __init__, which reads the whole file
+        edr.data = GMX_Unpacker(buf)
+        try:
+            edr.do_enxnms()
+        except EOFError:
+            if len(buf) < size:
+                return None
+            size *= 4
+            continue
+        return edr, edr.data.get_position()
 
 
 # ── COLVAR parsing ─────────────────────────────────────────────────────
@@ -126,101 +236,314 @@ def parse_colvar_file(
         <time> <val1> <val2> ...
 
     Returns a list of row dicts starting from ``from_line`` (line count
-    excluding comment/header lines).
+    excluding comment/header lines). Thin adapter over
+    :func:`parse_colvar_columns` for callers that want rows.
     """
-    if not Path(colvar_path).exists():
+    columns = parse_colvar_columns(colvar_path, from_line)
+    if not columns:
         return []
+    fields = list(columns)
+    return [dict(zip(fields, row)) for row in zip(*(c.tolist() for c in columns.values()))]
+
+
+def parse_colvar_columns(colvar_path: str, from_line: int = 0) -> dict[str, Any]:
+    """Parse a PLUMED COLVAR file into ``{field: ndarray}`` columns.
+
+    Each column is a contiguous float64 array of the data rows from
+    ``from_line`` on. Returns an empty dict if the file is missing or has no
+    such rows yet.
+    """
+    import numpy as np
+
+    loaded = _load_colvar(colvar_path)
+    if loaded is None:
+        return {}
+    fields, arr = loaded
+    arr = arr[from_line:]
+    if not len(arr):
+        return {}
+    return dict(zip(fields, np.ascontiguousarray(arr.T)))
+
+
+def _load_colvar(colvar_path: str) -> tuple[list[str], Any] | None:
+    """Read a COLVAR file into ``(fields, rows)`` with *rows* a 2-D float64 array.
+
+    Data lines are parsed in one ``np.loadtxt`` call from the first
+    ``#! FIELDS`` header on; comment lines, including repeated headers after a
+    restart, are skipped. Files ``loadtxt`` rejects (typically a trailing line
+    still being written) are re-read line by line, dropping malformed rows.
+    Returns None if the file or its header is missing.
+    """
+    import numpy as np
+
+    try:
+        with open(colvar_path) as fh:
+            while True:
+                line = fh.readline()
+                if not line:
+                    return None
+                if line.startswith("#! FIELDS"):
+                    fields = line.split()[2:]  # skip '#!' and 'FIELDS'
+                    break
+            start = fh.tell()
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")  # "input contained no data"
+                    arr = np.loadtxt(fh, comments="#", ndmin=2, dtype=np.float64)
+            except ValueError:
+                fh.seek(start)
+                arr = _colvar_rows_slow(fh, len(fields))
+    except OSError:
+        return None
+    if not arr.size:
+        arr = arr.reshape(0, len(fields))
+    # Like zip(): extra values are dropped, missing trailing fields are omitted.
+    n = min(len(fields), arr.shape[1])
+    return fields[:n], arr[:, :n]
+
+
+def _colvar_rows_slow(fh: Any, n_fields: int) -> Any:
+    import numpy as np
+
+    rows: list[list[float]] = []
+    for raw_line in fh:
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            vals = [float(v) for v in line.split()]
+        except ValueError:
+            continue
+        if len(vals) >= n_fields:
+            rows.append(vals[:n_fields])
+    return np.array(rows, dtype=np.float64).reshape(-1, n_fields)
+
 
+def parse_colvar_tail(
+    colvar_path: str,
+    from_offset: int = 0,
+    fields: list[str] | None = None,
+) -> tuple[list[dict[str, float]], int, list[str] | None]:
+    """Incremental variant of :func:`parse_colvar_file` driven by a byte offset.
+
+    Only complete lines appended after *from_offset* are parsed. *fields* is
+    the column list from an earlier ``#! FIELDS`` header, needed when the
+    header itself lies before *from_offset*.
+
+    Returns ``(rows, next_offset, fields)``; feed the last two back in on the
+    next call.
+    """
+    chunk, next_offset = _read_new_lines(colvar_path, from_offset)
+    if next_offset < from_offset:
+        fields = None  # file was replaced; its header is in this chunk
     rows: list[dict[str, float]] = []
-    headers: list[str] | None = None
-    data_line_count = 0
+    for raw_line in chunk.decode(errors="replace").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith("#! FIELDS"):
+            fields = line.split()[2:]
+            continue
+        if line.startswith("#") or not fields:
+            continue
+        try:
+            rows.append(dict(zip(fields, map(float, line.split()))))
+        except ValueError:
+            pass
+    return rows, next_offset, fields
 
-    with open(colvar_path) as fh:
-        for raw_line in fh:
-            line = raw_line.strip()
-            if not line:
-                continue
-            if line.startswith("#! FIELDS"):
-                headers = line.split()[2:]  # skip '#!' and 'FIELDS'
-                continue
-            if line.startswith("#"):
-                continue
-            # Data line
-            if data_line_count < from_line:
-                data_line_count += 1
-                continue
-            if headers:
-                try:
-                    vals = list(map(float, line.split()))
-                    rows.append(dict(zip(headers, vals)))
-                except ValueError:
-                    pass
-            data_line_count += 1
 
-    return rows
+def _read_new_lines(path: str, from_offset: int) -> tuple[bytes, int]:
+    """Return the complete lines written after *from_offset* and the offset past them.
+
+    The file is memory-mapped so only the new tail is touched. A file that is
+    now shorter than *from_offset* is assumed to have been replaced and is
+    read from the start. A trailing partial line is left for the next call.
+    """
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < from_offset:
+                from_offset = 0
+            if size == from_offset:
+                return b"", from_offset
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = mm.rfind(b"\n", from_offset) + 1
+                if end == 0:
+                    return b"", from_offset
+                return mm[from_offset:end], end
+    except (OSError, ValueError):
+        return b"", from_offset
 
 
 # ── HILLS parsing ──────────────────────────────────────────────────────
 
 
+_COUNT_CHUNK = 1 << 20
+
+
 def count_hills(hills_path: str) -> int:
     """Count the number of Gaussian hills deposited (non-comment data lines)."""
-    if not Path(hills_path).exists():
-        return 0
     count = 0
-    with open(hills_path) as fh:
-        for line in fh:
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#"):
-                count += 1
-    return count
+    carry = b""
+    try:
+        with open(hills_path, "rb") as fh:
+            # Count whole lines per chunk; a cut line is carried into the next one.
+            while chunk := fh.read(_COUNT_CHUNK):
+                buf = carry + chunk
+                end = buf.rfind(b"\n") + 1
+                count += _count_data_lines(buf[:end])
+                carry = buf[end:]
+    except OSError:
+        return 0
+    return count + _count_data_lines(carry)
+
+
+def count_new_hills(hills_path: str, from_offset: int = 0) -> tuple[int, int]:
+    """Count hills appended after byte *from_offset*.
+
+    Returns ``(new_hills, next_offset)``. If the file was replaced (it is now
+    shorter than *from_offset*), the count restarts from its beginning.
+    """
+    chunk, next_offset = _read_new_lines(hills_path, from_offset)
+    return _count_data_lines(chunk), next_offset
+
+
+def _count_data_lines(buf: bytes) -> int:
+    """Count non-blank, non-``#`` lines in *buf* without splitting it into lines.
+
+    Whitespace is deleted first so that blank lines collapse to empty ones and
+    indented comments start with ``#``; both can then be counted with C-level
+    ``bytes`` scans.
+    """
+    s = buf.translate(None, b" \t\r\f\v")
+    if not s:
+        return 0
+    lines = s.count(b"\n") + 1
+    comments = s.count(b"\n#") + s.startswith(b"#")
+    # Empty lines: one at either end of a leading/trailing newline, plus one per
+    # adjacent newline pair. Each pass merges such pairs, shrinking s by their count.
+    blanks = s.startswith(b"\n") + s.endswith(b"\n")
+    while b"\n\n" in s:
+        merged = s.replace(b"\n\n", b"\n")
+        blanks += len(s) - len(merged)
+        s = merged
+    return lines - comments - blanks
 
 
 # ── GROMACS .log parsing ───────────────────────────────────────────────
 
 
+# Enough for several energy blocks, so the latest Step/Time pair is in the tail.
+_LOG_TAIL_BYTES = 64 * 1024
+
+
 def parse_gromacs_log_progress(log_path: str) -> dict[str, Any] | None:
     """Extract the latest performance/step info from a GROMACS .log file.
 
+    Only the last 64 KiB are scanned; the whole file is read only if that
+    tail holds no Step/Time pair.
+
     Returns a dict with keys: 'step', 'time_ps', 'ns_per_day' (if available),
     or None if the file does not exist / no data yet.
     """
-    if not Path(log_path).exists():
+    try:
+        with open(log_path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            start = max(0, size - _LOG_TAIL_BYTES)
+            fh.seek(start)
+            tail = fh.read()
+            if start > 0:
+                tail = tail[tail.find(b"\n") + 1 :]  # first line is probably cut
+            info = _scan_log(tail)
+            if info is None and start > 0:
+                fh.seek(0)
+                info = _scan_log(fh.read())
+    except OSError:
         return None
+    return info
+
+
+def parse_gromacs_log_tail(
+    log_path: str,
+    from_offset: int = 0,
+) -> tuple[dict[str, Any] | None, int]:
+    """Incremental variant of :func:`parse_gromacs_log_progress`.
+
+    Scans only complete lines written after byte *from_offset*. Returns
+    ``(info, next_offset)``; keys of *info* missing from those lines are
+    None, and *info* itself is None if none were found. ``ns_per_day`` is
+    only set once the run's final Performance line has been written.
+    """
+    chunk, next_offset = _read_new_lines(log_path, from_offset)
+    return _scan_log(chunk, require_step=False), next_offset
+
 
+# Step/Time rows look like "          50000       100.000" (below a
+# "Step Time" header); the run ends with "Performance:    3.456 ns/day ...".
+_LOG_STEP_RE = re.compile(rb"\s*(\d+)\s+([-+\d.eE]+)\s*")
+_LOG_PERF_RE = re.compile(rb"\s*Performance:\s+(\S+)")
+
+
+def _scan_log(buf: bytes, require_step: bool = True) -> dict[str, Any] | None:
+    """Find the latest Step/Time row and Performance line in a chunk of log text.
+
+    Lines are scanned from the end. The Performance line is only ever written
+    after the last step, so the scan stops at the first Step/Time row it meets.
+    """
     step: int | None = None
     time_ps: float | None = None
     ns_per_day: float | None = None
 
-    with open(log_path) as fh:
-        for line in fh:
-            # Lines look like: "           Step           Time"
-            # followed by:     "          50000       100.000"
-            stripped = line.strip()
-            if stripped.startswith("Step") and "Time" in stripped:
-                continue  # header line
-            parts = stripped.split()
-            if len(parts) == 2:
+    for line in reversed(buf.splitlines()):
+        match = _LOG_STEP_RE.fullmatch(line)
+        if match:
+            try:
+                time_ps = float(match[2])
+            except ValueError:
+                continue
+            step = int(match[1])
+            break
+        if ns_per_day is None:
+            match = _LOG_PERF_RE.match(line)
+            if match:
                 try:
-                    step = int(parts[0])
-                    time_ps = float(parts[1])
+                    ns_per_day = float(match[1])
                 except ValueError:
                     pass
-            # Performance line: "Performance:    3.456 ns/day ..."
-            if stripped.startswith("Performance:"):
-                try:
-                    ns_per_day = float(stripped.split()[1])
-                except (IndexError, ValueError):
-                    pass
 
-    if step is None:
+    if step is None and (require_step or ns_per_day is None):
         return None
     return {"step": step, "time_ps": time_ps, "ns_per_day": ns_per_day}
 
 
+# Stats younger than this are reused, so bursts of polls cost one stat per file.
+_MTIME_TTL_S = 0.1
+# Expired entries are pruned once the cache grows past this many paths.
+_MTIME_CACHE_MAX = 256
+_mtime_cache: dict[str, tuple[float, float]] = {}  # path -> (cached_at, mtime)
+
+
 def get_file_mtime(path: str) -> float:
-    """Return file modification time, or 0.0 if file does not exist."""
+    """Return file modification time, or 0.0 if file does not exist.
+
+    Results are cached for 100 ms; call ``get_file_mtime.cache_clear()``
+    when a fresh value is required.
+    """
+    now = time.monotonic()
+    hit = _mtime_cache.get(path)
+    if hit is not None and now - hit[0] < _MTIME_TTL_S:
+        return hit[1]
     try:
-        return os.stat(path).st_mtime
+        mtime = os.stat(path).st_mtime
     except FileNotFoundError:
-        return 0.0
+        mtime = 0.0
+    if len(_mtime_cache) >= _MTIME_CACHE_MAX:
+        for key, (cached_at, _) in list(_mtime_cache.items()):
+            if now - cached_at >= _MTIME_TTL_S:
+                _mtime_cache.pop(key, None)
+    _mtime_cache[path] = (now, mtime)
+    return mtime
+
+
+get_file_mtime.cache_clear = _mtime_cache.clear  # type: ignore[attr-defined]
@@ -0,0 +1,221 @@
+"""Tests for MDAgent tool dispatch helpers — no Anthropic API calls."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from md_agent.agent import _PARALLEL_SAFE_TOOLS, TOOLS, MDAgent, _tool_batches
+
+
+def _block(name: str) -> SimpleNamespace:
+    return SimpleNamespace(type="tool_use", id=f"id_{name}", name=name, input={})
+
+
+class TestToolBatches:
+    def test_parallel_safe_tools_are_known(self):
+        names = {t["name"] for t in TOOLS}
+        assert _PARALLEL_SAFE_TOOLS <= names
+
+    def test_consecutive_safe_tools_share_a_batch(self):
+        blocks = [_block("search_semantic_scholar"), _block("fetch_arxiv_paper")]
+        batches = _tool_batches(blocks)
+        assert [[b.name for b in batch] for batch in batches] == [
+            ["search_semantic_scholar", "fetch_arxiv_paper"]
+        ]
+
+    def test_stateful_tools_run_alone_in_order(self):
+        blocks = [
+            _block("read_file"),
+            _block("run_grompp"),
+            _block("run_mdrun"),
+            _block("list_files"),
+            _block("read_file"),
+        ]
+        batches = _tool_batches(blocks)
+        assert [[b.name for b in batch] for batch in batches] == [
+            ["read_file"],
+            ["run_grompp"],
+            ["run_mdrun"],
+            ["list_files", "read_file"],
+        ]
+
+    def test_download_is_a_barrier_for_reads(self):
+        blocks = [_block("download_pdf"), _block("extract_text_from_pdf"), _block("read_file")]
+        batches = _tool_batches(blocks)
+        assert [[b.name for b in batch] for batch in batches] == [
+            ["download_pdf"],
+            ["extract_text_from_pdf", "read_file"],
+        ]
+
+    def test_empty(self):
+        assert _tool_batches([]) == []
+
+
+class _FakeStream:
+    """Minimal stand-in for anthropic's MessageStream context manager."""
+
+    def __init__(self, message):
+        self._message = message
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for block in self._message.content:
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    def get_final_message(self):
+        return self._message
+
+
+@pytest.fixture
+def agent(tmp_path, mocker):
+    mocker.patch("md_agent.agent.get_anthropic_client")
+    from omegaconf import OmegaConf
+
+    return MDAgent(cfg=OmegaConf.create({}), work_dir=str(tmp_path))
+
+
+class TestRun:
+    def test_executes_tools_then_returns_text(self, agent, mocker):
+        tool_turn = SimpleNamespace(
+            stop_reason="tool_use",
+            content=[_block("list_files"), _block("read_file")],
+        )
+        final_turn = SimpleNamespace(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="done")],
+        )
+        agent._client.messages.stream.side_effect = [
+            _FakeStream(tool_turn),
+            _FakeStream(final_turn),
+        ]
+        execute = mocker.patch.object(agent, "_execute_tool", return_value={"ok": True})
+
+        assert agent.run("hi") == "done"
+        assert [c.args[0] for c in execute.call_args_list] == ["list_files", "read_file"]
+        tool_results = agent._messages[2]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["id_list_files", "id_read_file"]
+
+    def test_stateful_tools_not_run_on_unexpected_stop(self, agent, mocker):
+        turn = SimpleNamespace(stop_reason="max_tokens", content=[_block("run_mdrun")])
+        agent._client.messages.stream.return_value = _FakeStream(turn)
+        execute = mocker.patch.object(agent, "_execute_tool")
+
+        agent.run("hi")
+        execute.assert_not_called()
+
+    def test_interrupt_discards_unfinished_turn(self, agent, mocker):
+        agent._messages = [
+            {"role": "user", "content": "earlier"},
+            {"role": "assistant", "content": "ok"},
+        ]
+        tool_turn = SimpleNamespace(stop_reason="tool_use", content=[_block("wait_mdrun")])
+        agent._client.messages.stream.return_value = _FakeStream(tool_turn)
+        mocker.patch.object(agent, "_execute_tool", side_effect=KeyboardInterrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            agent.run("wait for it")
+        assert [m["content"] for m in agent._messages] == ["earlier", "ok"]
+
+
+class _FakeAsyncStream(_FakeStream):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for event in super().__iter__():
+            yield event
+
+    async def get_final_message(self):
+        return self._message
+
+
+class TestArun:
+    def test_executes_tools_then_returns_text(self, agent, mocker):
+        tool_turn = SimpleNamespace(
+            stop_reason="tool_use",
+            content=[_block("search_semantic_scholar"), _block("run_grompp")],
+        )
+        final_turn = SimpleNamespace(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="done")],
+        )
+        assert agent._aclient is None  # only built once arun() is used
+        aclient = mocker.patch("md_agent.agent.anthropic.AsyncAnthropic").return_value
+        aclient.messages.stream.side_effect = [
+            _FakeAsyncStream(tool_turn),
+            _FakeAsyncStream(final_turn),
+        ]
+        execute = mocker.patch.object(agent, "_execute_tool", return_value={"ok": True})
+
+        assert asyncio.run(agent.arun("hi")) == "done"
+        assert [c.args[0] for c in execute.call_args_list] == [
+            "search_semantic_scholar",
+            "run_grompp",
+        ]
+        tool_results = agent._messages[2]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == [
+            "id_search_semantic_scholar",
+            "id_run_grompp",
+        ]
+
+
+class TestToolResultEncoding:
+    def test_numpy_and_unknown_types(self):
+        import json
+        from pathlib import Path
+
+        import numpy as np
+
+        from md_agent.utils.json_utils import dumps
+
+        out = json.loads(dumps({"n": np.float64(1.5), 3: Path("/tmp/x"), "a": np.arange(2)}))
+        assert out == {"n": 1.5, "3": "/tmp/x", "a": [0, 1]}
+
+    def test_strided_array_and_bytes(self):
+        import numpy as np
+
+        from md_agent.utils.json_utils import dumpb
+
+        # Non-contiguous views are not handled natively by orjson
+        assert dumpb({"t": np.arange(6.0)[::2], "z": np.nan}) == b'{"t":[0.0,2.0,4.0],"z":null}'
+
+    def test_indent(self):
+        from md_agent.utils.json_utils import dumps
+
+        assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+
+
+class TestHistory:
+    def test_cache_breakpoint_on_copy_only(self):
+        from md_agent.agent import _with_cache_breakpoint
+
+        messages = [
+            {"role": "user", "content": "hi"},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "a"}]},
+        ]
+        marked = _with_cache_breakpoint(messages)
+        assert marked[-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in messages[-1]["content"][-1]
+        assert _with_cache_breakpoint(messages[:1])[0]["content"] == [
+            {"type": "text", "text": "hi", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_thinking_dropped_from_finished_turns(self, agent):
+        thinking = SimpleNamespace(type="thinking", thinking="...")
+        text = SimpleNamespace(type="text", text="done")
+        final_turn = SimpleNamespace(stop_reason="end_turn", content=[thinking, text])
+        agent._client.messages.stream.return_value = _FakeStream(final_turn)
+
+        agent.run("first")
+        assert agent._messages[1]["content"] == [thinking, text]
+        agent.run("second")
+        assert agent._messages[1]["content"] == [text]
@@ -0,0 +1,74 @@
+"""Tests for the ``amd`` CLI config helpers."""
+
+import os
+from pathlib import Path
+
+import pytest
+from omegaconf import OmegaConf
+
+from md_agent.cli import _compose_base, _load_hydra_cfg, _run_stamp, _stage
+
+CONF_DIR = str(Path(__file__).parents[1] / "conf")
+
+
+@pytest.fixture(autouse=True)
+def clear_compose_cache():
+    _compose_base.cache_clear()
+    yield
+    _compose_base.cache_clear()
+
+
+class TestLoadHydraCfg:
+    def test_sets_work_dir(self, tmp_path):
+        cfg = _load_hydra_cfg(CONF_DIR, ["mode=run"], str(tmp_path))
+        assert cfg.run.work_dir == str(tmp_path)
+        assert cfg.mode == "run"
+
+    def test_compose_is_cached(self, tmp_path):
+        _load_hydra_cfg(CONF_DIR, ["mode=run"], str(tmp_path / "a"))
+        _load_hydra_cfg(CONF_DIR, ["mode=run"], str(tmp_path / "b"))
+        info = _compose_base.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_cached_configs_are_independent(self, tmp_path):
+        a = _load_hydra_cfg(CONF_DIR, [], str(tmp_path / "a"))
+        b = _load_hydra_cfg(CONF_DIR, [], str(tmp_path / "b"))
+        OmegaConf.update(a, "gromacs.temperature", 350)
+        assert a.run.work_dir != b.run.work_dir
+        assert b.gromacs.temperature != 350
+
+    def test_interpolations_follow_updates(self, tmp_path):
+        cfg = _load_hydra_cfg(CONF_DIR, [], str(tmp_path))
+        OmegaConf.update(cfg, "gromacs.temperature", 350)
+        assert cfg.method.hills.temp == 350
+
+
+class TestStage:
+    def test_copies_content(self, tmp_path):
+        src = tmp_path / "topol.top"
+        src.write_text("[ molecules ]\nProtein 1\n")
+        dst = tmp_path / "out.top"
+        _stage(src, dst)
+        assert dst.read_text() == src.read_text()
+
+    def test_copy_is_independent_of_source(self, tmp_path):
+        src = tmp_path / "ala2.gro"
+        src.write_text("original\n")
+        dst = tmp_path / "copy.gro"
+        _stage(src, dst)
+        dst.write_text("modified\n")
+        assert src.read_text() == "original\n"
+
+    def test_falls_back_to_shutil(self, tmp_path, mocker):
+        mocker.patch("md_agent.cli.os.copy_file_range", side_effect=OSError("EXDEV"))
+        src = tmp_path / "a.itp"
+        src.write_text("; itp\n")
+        dst = tmp_path / "b.itp"
+        _stage(src, dst)
+        assert dst.read_text() == "; itp\n"
+
+
+class TestRunStamp:
+    def test_includes_pid(self):
+        assert _run_stamp().endswith(f"_{os.getpid()}")
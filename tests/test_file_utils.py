@@ -0,0 +1,42 @@
+"""Tests for file reading and listing helpers."""
+
+from pathlib import Path
+
+from md_agent.utils.file_utils import list_files, read_file
+
+
+class TestReadFile:
+    def test_head_and_tail(self, tmp_path):
+        path = tmp_path / "md.log"
+        path.write_text("".join(f"line {i}\n" for i in range(10)))
+        assert read_file(str(path), max_lines=2) == "line 0\nline 1"
+        assert read_file(str(path), max_lines=2, tail=True) == "line 8\nline 9"
+        assert read_file(str(path)) == "\n".join(f"line {i}" for i in range(10))
+
+    def test_blank_lines_kept(self, tmp_path):
+        path = tmp_path / "f.txt"
+        path.write_text("a\n\n")
+        assert read_file(str(path)) == "a\n"
+
+    def test_missing_file(self, tmp_path):
+        assert read_file(str(tmp_path / "nope")).startswith("[Error] File not found")
+
+
+class TestListFiles:
+    def test_matches_glob(self, tmp_path, monkeypatch):
+        (tmp_path / "sub" / "deep").mkdir(parents=True)
+        for rel in ("a.mdp", "b.txt", "sub/c.mdp", "sub/deep/d.mdp", "sub/deep/.e.mdp"):
+            (tmp_path / rel).write_text("")
+        (tmp_path / "dir.mdp").mkdir()
+
+        for directory in (str(tmp_path), "."):
+            monkeypatch.chdir(tmp_path)
+            base = Path(directory)
+            for pattern in ("*.mdp", "*", "sub/*.mdp"):
+                for recursive in (False, True):
+                    glob_pattern = f"**/{pattern}" if recursive else pattern
+                    expected = sorted(str(p) for p in base.glob(glob_pattern) if p.is_file())
+                    assert list_files(directory, pattern, recursive) == expected
+
+    def test_missing_directory(self, tmp_path):
+        assert list_files(str(tmp_path / "nope")) == []
@@ -77,6 +77,45 @@ class TestMdrun:
         assert "-append" in call_args
         assert result["status"] == "running"
 
+    def test_thread_layout_defaults_to_available_cores(self, runner, tmp_path):
+        (tmp_path / "md.tpr").touch()
+        with (
+            patch("md_agent.tools.gromacs_tools._available_cores", return_value=6),
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            mock_popen.return_value = MagicMock(pid=1, poll=MagicMock(return_value=None))
+            runner.mdrun(tpr_file="md.tpr", output_prefix="md")
+        call_args = mock_popen.call_args[0][0]
+        assert call_args[call_args.index("-ntomp") + 1] == "6"
+        assert call_args[call_args.index("-ntmpi") + 1] == "1"
+        assert call_args[call_args.index("-pin") + 1] == "off"
+
+    def test_detected_threads_capped_explicit_count_pinned_by_gromacs(self, runner, tmp_path):
+        (tmp_path / "md.tpr").touch()
+        with (
+            patch("md_agent.tools.gromacs_tools._available_cores", return_value=256),
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            mock_popen.return_value = MagicMock(pid=1, poll=MagicMock(return_value=None))
+            runner.mdrun(tpr_file="md.tpr", output_prefix="md")
+            auto_args = mock_popen.call_args[0][0]
+            runner.mdrun(tpr_file="md.tpr", output_prefix="md", n_cores=8)
+            explicit_args = mock_popen.call_args[0][0]
+        assert auto_args[auto_args.index("-ntomp") + 1] == "64"
+        assert explicit_args[explicit_args.index("-ntomp") + 1] == "8"
+        assert "-pin" not in explicit_args
+
+    def test_gpu_in_docker_uses_container_index(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+        (tmp_path / "md.tpr").touch()
+        with patch("subprocess.Popen") as mock_popen:
+            mock_popen.return_value = MagicMock(pid=1, poll=MagicMock(return_value=None))
+            runner.mdrun(tpr_file="md.tpr", output_prefix="md", gpu_id="5")
+        call_args = mock_popen.call_args[0][0]
+        assert call_args[call_args.index("--gpus") + 1] == "device=5"
+        assert call_args[call_args.index("-gpu_id") + 1] == "0"
+        assert call_args[call_args.index("-nb") + 1] == "gpu"
+
     def test_resume_missing_cpt_returns_error(self, runner, tmp_path):
         (tmp_path / "md.tpr").touch()
         result = runner.mdrun(tpr_file="md.tpr", output_prefix="md", cpt_file="nonexistent.cpt")
@@ -119,3 +158,135 @@ class TestConvertTpr:
         (tmp_path / "md.tpr").touch()
         result = runner.convert_tpr(input_tpr="md.tpr", output_tpr="out.tpr")
         assert "error" in result
+
+
+class TestPipeline:
+    STEPS = [["editconf", "-f", "a.gro"], ["solvate", "-cp", "b.gro"], ["grompp", "-f", "md.mdp"]]
+
+    def test_local_stops_at_first_failure(self, runner, tmp_path):
+        procs = [_mock_proc(0), _mock_proc(1, stderr="solvate broke")]
+        with patch("subprocess.Popen", side_effect=procs) as mock_popen:
+            result = runner.run_gmx_pipeline(self.STEPS, work_dir=str(tmp_path))
+        assert mock_popen.call_count == 2
+        assert result["failed_step"] == 1
+        assert "solvate broke" in result["stderr"]
+
+    def test_docker_runs_one_container(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+        runner._warm = False
+        with patch("subprocess.Popen", return_value=_mock_proc(0, stderr="ERROR 1")) as mock_popen:
+            result = runner.run_gmx_pipeline(self.STEPS, work_dir=str(tmp_path))
+        cmd = mock_popen.call_args[0][0]
+        assert mock_popen.call_count == 1
+        assert cmd[-3:-1] == ["sh", "-c"]
+        assert "gmx solvate -cp b.gro || exit 2" in cmd[-1]
+        # A trailing grompp is classified like GROMACSRunner.grompp
+        assert result["success"] is False
+        assert result["failed_step"] == 2
+
+
+class TestWarmContainer:
+    def test_commands_exec_into_one_container(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+
+        def fake_run(cmd, **kwargs):
+            out = "true\n" if cmd[1] == "inspect" else "cid123\n"
+            return MagicMock(returncode=0, stdout=out)
+
+        with (
+            patch("subprocess.run", side_effect=fake_run) as mock_run,
+            patch("subprocess.Popen", return_value=_mock_proc(0)) as mock_popen,
+        ):
+            runner.run_gmx_command("editconf", ["-f", "a.gro"], work_dir=str(tmp_path))
+            runner.run_gmx_command("solvate", ["-cp", "b.gro"], work_dir=str(tmp_path))
+            runner.close()
+
+        starts = [c.args[0] for c in mock_run.call_args_list if c.args[0][1] == "run"]
+        assert len(starts) == 1
+        assert starts[0][-2:] == ["sleep", "infinity"] and "-d" in starts[0]
+        cmds = [c.args[0] for c in mock_popen.call_args_list]
+        assert cmds[0][:6] == ["docker", "exec", "-i", "-w", "/work", "cid123"]
+        assert cmds[1][5:] == ["cid123", "gmx", "solvate", "-cp", "b.gro"]
+        assert cmds[-1] == ["docker", "rm", "-f", "cid123"]
+
+    def test_mdrun_gets_its_own_container(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+        (tmp_path / "md.tpr").touch()
+        with (
+            patch("subprocess.run") as mock_run,
+            patch("subprocess.Popen", return_value=_mock_proc(0)) as mock_popen,
+        ):
+            runner.mdrun(tpr_file="md.tpr", output_prefix="md")
+        mock_run.assert_not_called()
+        assert mock_popen.call_args[0][0][:2] == ["docker", "run"]
+
+    def test_container_that_exits_falls_back_to_docker_run(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+
+        def fake_run(cmd, **kwargs):
+            # `run -d` succeeds, but the container is gone by the exec probe
+            return MagicMock(returncode=1 if cmd[1] == "exec" else 0, stdout="cid123\n")
+
+        with (
+            patch("subprocess.run", side_effect=fake_run) as mock_run,
+            patch("subprocess.Popen", return_value=_mock_proc(0)) as mock_popen,
+        ):
+            runner.run_gmx_command("editconf", ["-f", "a.gro"], work_dir=str(tmp_path))
+            runner.run_gmx_command("solvate", ["-cp", "b.gro"], work_dir=str(tmp_path))
+
+        assert sum(c.args[0][1] == "run" for c in mock_run.call_args_list) == 1
+        cmds = [c.args[0] for c in mock_popen.call_args_list]
+        assert cmds[0] == ["docker", "rm", "-f", "cid123"]
+        assert [c[:2] for c in cmds[1:]] == [["docker", "run"], ["docker", "run"]]
+
+    def test_exec_into_dead_container_is_retried_with_docker_run(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+        runner._warm_container = "cid123"
+        procs = [_mock_proc(1), _mock_proc(0), _mock_proc(0, stdout="ok")]
+        # running when picked for the exec, gone when the failure is checked
+        states = [MagicMock(returncode=0, stdout="true\n"), MagicMock(returncode=1, stdout="")]
+        with (
+            patch("subprocess.run", side_effect=states),
+            patch("subprocess.Popen", side_effect=procs) as mock_popen,
+        ):
+            result = runner.run_gmx_command("editconf", ["-f", "a.gro"], work_dir=str(tmp_path))
+
+        cmds = [c.args[0] for c in mock_popen.call_args_list]
+        assert cmds[0][:2] == ["docker", "exec"]
+        assert cmds[1] == ["docker", "rm", "-f", "cid123"]
+        assert cmds[2][:2] == ["docker", "run"] and cmds[2][-3:] == ["editconf", "-f", "a.gro"]
+        assert result["success"] is True and result["stdout"] == "ok"
+        assert runner._warm is False
+
+    def test_command_failure_in_live_container_is_not_retried(self, runner, tmp_path):
+        runner._docker_image = "gromacs:latest"
+        runner._warm_container = "cid123"
+        running = MagicMock(returncode=0, stdout="true\n")
+        with (
+            patch("subprocess.run", return_value=running),
+            patch("subprocess.Popen", return_value=_mock_proc(127, stderr="not found")) as popen,
+        ):
+            result = runner.run_gmx_command(
+                "genion", ["-s", "ions.tpr"], stdin_text="SOL\n", work_dir=str(tmp_path)
+            )
+        popen.assert_called_once()
+        assert result["returncode"] == 127
+        assert runner._warm_container == "cid123"
+
+    def test_orphans_swept_once_per_process(self, tmp_path, monkeypatch):
+        from md_agent.tools import gromacs_tools
+
+        monkeypatch.setenv("GMX_DOCKER_IMAGE", "gromacs:latest")
+        monkeypatch.setattr(gromacs_tools, "_swept", False)
+        monkeypatch.setattr(gromacs_tools, "_pid_alive", lambda pid: pid == 42)
+        listed = MagicMock(returncode=0, stdout="dead 7\nlive 42\nunlabelled \n")
+        with (
+            patch("subprocess.run", return_value=listed) as mock_run,
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            GROMACSRunner(work_dir=str(tmp_path))
+            GROMACSRunner(work_dir=str(tmp_path))
+        assert mock_run.call_count == 1
+        assert f"label=amd.owner={gromacs_tools._owner_id()}" in mock_run.call_args[0][0]
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args[0][0] == ["docker", "rm", "-f", "dead"]
@@ -1,6 +1,5 @@
 """Tests for paper retrieval and settings extraction."""
 
-import json
 from unittest.mock import MagicMock
 
 import pytest
@@ -46,6 +45,18 @@ class TestNormalizeExtractedSettings:
         assert result["plumed"]["hills_sigma"][0] == pytest.approx(0.35)
         assert result["plumed"]["hills_sigma"][1] == pytest.approx(0.5)
 
+    def test_force_constant_and_unknown_units(self):
+        settings = {
+            "plumed": {
+                "force_constant": 10.0,
+                "force_constant_unit": "kcal/mol/Å^2",
+                "hills_height": 2.0,
+                "hills_height_unit": "eV",
+            }
+        }
+        plumed = normalize_extracted_settings(settings)["plumed"]
+        assert plumed == {"force_constant": pytest.approx(4184.0), "hills_height": 2.0}
+
     def test_no_conversion_needed(self):
         settings = {
             "plumed": {
@@ -56,36 +67,313 @@ class TestNormalizeExtractedSettings:
         assert result["plumed"]["hills_height"] == pytest.approx(1.2)
 
 
+def _tool_response(*inputs: dict) -> list[MagicMock]:
+    """Mock messages.create responses, each a single extract_md_settings tool_use block."""
+    responses = []
+    for i, data in enumerate(inputs):
+        block = MagicMock(type="tool_use", input=data, id=f"toolu_{i}")
+        responses.append(MagicMock(content=[block]))
+    return responses
+
+
+_VALID_SETTINGS = {
+    "method": "metadynamics",
+    "gromacs": {"dt": 0.002, "temperature": 300},
+    "plumed": {"hills_height": 1.2, "hills_sigma": [0.35], "hills_pace": 500},
+    "system": {"forcefield": "charmm36m"},
+    "notes": "",
+    "confidence": "high",
+}
+
+
 class TestMDSettingsExtractor:
-    def _make_extractor(self, response_text: str):
+    def _make_extractor(self, *inputs: dict):
         from md_agent.tools.paper_tools import MDSettingsExtractor
 
         mock_client = MagicMock()
-        mock_block = MagicMock()
-        mock_block.text = response_text
-        mock_block.type = "text"
-        mock_response = MagicMock()
-        mock_response.content = [mock_block]
-        mock_client.messages.create.return_value = mock_response
-        return MDSettingsExtractor(mock_client)
-
-    def test_extracts_valid_json(self):
-        response = json.dumps(
-            {
-                "method": "metadynamics",
-                "gromacs": {"dt": 0.002, "temperature": 300},
-                "plumed": {"hills_height": 1.2, "hills_sigma": [0.35], "hills_pace": 500},
-                "system": {"forcefield": "charmm36m"},
-                "notes": "",
-                "confidence": "high",
-            }
-        )
-        extractor = self._make_extractor(response)
+        mock_client.messages.create.side_effect = _tool_response(*inputs)
+        return MDSettingsExtractor(mock_client), mock_client
+
+    def test_extracts_tool_input(self):
+        extractor, client = self._make_extractor(_VALID_SETTINGS)
         result = extractor.extract_md_settings_from_text("paper text")
         assert result["method"] == "metadynamics"
         assert result["gromacs"]["temperature"] == 300
+        kwargs = client.messages.create.call_args.kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "extract_md_settings"}
+
+    def test_retries_with_validation_feedback(self):
+        extractor, client = self._make_extractor({"method": "replica"}, _VALID_SETTINGS)
+        result = extractor.extract_md_settings_from_text("text")
+        assert result["method"] == "metadynamics"
+        assert client.messages.create.call_count == 2
+        feedback = client.messages.create.call_args.kwargs["messages"][-1]["content"][0]
+        assert feedback["tool_use_id"] == "toolu_0"
+        assert feedback["is_error"] is True
 
-    def test_handles_no_json_in_response(self):
-        extractor = self._make_extractor("I cannot find simulation parameters.")
+    def test_gives_up_after_max_retries(self):
+        bad = {"method": "replica"}
+        extractor, client = self._make_extractor(bad, bad, bad)
         result = extractor.extract_md_settings_from_text("text")
+        assert result["method"] == "replica"
+        assert client.messages.create.call_count == 3
+
+    def test_handles_missing_tool_call(self):
+        from md_agent.tools.paper_tools import MDSettingsExtractor
+
+        client = MagicMock()
+        text = MagicMock(type="text", text="I cannot find simulation parameters.")
+        client.messages.create.return_value = MagicMock(content=[text])
+        result = MDSettingsExtractor(client).extract_md_settings_from_text("text")
         assert "error" in result
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    """Build a minimal multi-page PDF with one line of Helvetica text per page."""
+    n = len(pages)
+    font_id = 3 + 2 * n
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n
+        ),
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    )
+    return out
+
+
+class TestExtractTextFromPdf:
+    def test_reads_path(self, tmp_path):
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        pdf = tmp_path / "paper.pdf"
+        pdf.write_bytes(_make_pdf(["Introduction text", "Methods: dt = 2 fs"]))
+        result = PaperRetriever().extract_text_from_pdf(str(pdf))
+        assert "dt = 2 fs" in result["text"]
+        assert result["total_pages"] == 2
+
+    def test_reads_file_object(self):
+        import io
+
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        buf = io.BytesIO(_make_pdf(["Simulation details: 300 K"]))
+        result = PaperRetriever().extract_text_from_pdf(buf)
+        assert "300 K" in result["text"]
+
+    def test_prefers_pymupdf_when_installed(self, tmp_path, mocker):
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        page = mocker.MagicMock()
+        page.get_text.return_value = "Methods: 300 K\n"
+        doc = mocker.MagicMock()
+        doc.__enter__.return_value = doc
+        doc.__iter__.return_value = iter([page])
+        fitz = mocker.MagicMock()
+        fitz.open.return_value = doc
+        mocker.patch.dict("sys.modules", {"fitz": fitz})
+
+        pdf = tmp_path / "paper.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        result = PaperRetriever().extract_text_from_pdf(str(pdf))
+        fitz.open.assert_called_once_with(str(pdf))
+        assert result["text"] == "Methods: 300 K"
+
+    def test_missing_path(self, tmp_path):
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        result = PaperRetriever().extract_text_from_pdf(str(tmp_path / "nope.pdf"))
+        assert "error" in result
+
+
+class TestPaperRetrieverSession:
+    def test_pooled_adapter_with_retries(self):
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        with PaperRetriever() as retriever:
+            adapter = retriever._session.get_adapter("https://api.semanticscholar.org")
+            assert adapter.max_retries.total == 3
+            assert 429 in adapter.max_retries.status_forcelist
+            assert retriever._session.get_adapter("http://example.org") is adapter
+
+    def test_stream_pdf_uses_session(self, mocker):
+        import io
+
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        retriever = PaperRetriever()
+        resp = mocker.MagicMock()
+        resp.__enter__.return_value = resp
+        resp.raw = io.BytesIO(b"%PDF-1.4")
+        get = mocker.patch.object(retriever._session, "get", return_value=resp)
+
+        buf = io.BytesIO()
+        assert retriever.stream_pdf("https://example.org/p.pdf", buf) == 8
+        assert buf.getvalue() == b"%PDF-1.4"
+        get.assert_called_once()
+
+    def test_download_pdf_reports_size(self, tmp_path, mocker):
+        import io
+
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        retriever = PaperRetriever()
+        resp = mocker.MagicMock()
+        resp.__enter__.return_value = resp
+        resp.raw = io.BytesIO(b"x" * 4096)
+        mocker.patch.object(retriever._session, "get", return_value=resp)
+
+        out = tmp_path / "pdfs" / "p.pdf"
+        result = retriever.download_pdf("https://example.org/p.pdf", str(out))
+        assert result == {"output_path": str(out), "size_kb": 4}
+        assert out.read_bytes() == b"x" * 4096
+
+    def test_download_pdfs_keeps_order(self, tmp_path, mocker):
+        from md_agent.tools.paper_tools import PaperRetriever
+
+        retriever = PaperRetriever()
+        mocker.patch.object(
+            retriever, "download_pdf", side_effect=lambda url, path: {"output_path": path}
+        )
+        pairs = [(f"https://example.org/{i}.pdf", str(tmp_path / f"{i}.pdf")) for i in range(5)]
+        results = retriever.download_pdfs(pairs)
+        assert [r["output_path"] for r in results] == [p for _, p in pairs]
+        assert retriever.download_pdfs([]) == []
+
+
+class TestReadThroughMethods:
+    def test_stops_after_methods_window(self):
+        from md_agent.tools.paper_tools import _read_through_methods
+
+        read: list[str] = []
+
+        def pages():
+            for text in ["Intro", "Methods here", "a" * 50, "b" * 50, "c" * 50]:
+                read.append(text)
+                yield text
+
+        parts = _read_through_methods(pages(), max_chars=60)
+        assert parts == ["Intro", "Methods here", "a" * 50]
+        assert read == parts
+
+    def test_reads_everything_without_primary_marker(self):
+        from md_agent.tools.paper_tools import _read_through_methods
+
+        texts = ["Intro", "Simulation details", "x" * 10, "y"]
+        assert _read_through_methods(iter(texts), max_chars=1) == texts
+
+    def test_leading_marker_does_not_short_circuit(self):
+        from md_agent.tools.paper_tools import _read_through_methods
+
+        texts = ["Methods overview", "", "Simulation setup", "z" * 10]
+        assert _read_through_methods(iter(texts), max_chars=1) == [
+            "Methods overview",
+            "Simulation setup",
+            "z" * 10,
+        ]
+
+
+class TestMethodsStart:
+    @staticmethod
+    def _reference(text: str) -> int:
+        from md_agent.tools.paper_tools import _METHODS_MARKERS
+
+        lower = text.lower()
+        for marker in _METHODS_MARKERS:
+            idx = lower.find(marker)
+            if idx > 0:
+                return max(0, idx - 200)
+        return 0
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "no markers at all",
+            "methods first then simulation details",
+            "intro " * 50 + "simulation setup " + "x" * 300 + " methods",
+            "computational methods",
+            "x" * 400 + "computational details " + "y" * 400 + "computational methods",
+            "simulation protocol" + " z" * 150 + " molecular dynamics simulation",
+            "Intro. " + "x" * 300 + "2. Computational Details " + "y" * 300 + "METHODS",
+        ],
+    )
+    def test_matches_priority_scan(self, text):
+        from md_agent.tools.paper_tools import _methods_start
+
+        assert _methods_start(text) == self._reference(text)
+
+
+class TestExtractionCache:
+    _SETTINGS = {
+        "method": "metadynamics",
+        "plumed": {"hills_height": 1.0, "hills_height_unit": "kcal/mol"},
+    }
+
+    def _make_extractor(self, cache_dir):
+        from md_agent.tools.paper_tools import MDSettingsExtractor
+
+        client = MagicMock()
+        client.messages.create.side_effect = lambda **_: _tool_response(self._SETTINGS)[0]
+        return MDSettingsExtractor(client, cache_dir=str(cache_dir)), client
+
+    def test_hit_skips_claude_and_normalizes(self, tmp_path):
+        extractor, client = self._make_extractor(tmp_path)
+        first = extractor.extract_md_settings_from_text("paper", paper_title="T")
+        second = extractor.extract_md_settings_from_text("paper", paper_title="T")
+        assert client.messages.create.call_count == 1
+        assert first == second
+        assert second["plumed"]["hills_height"] == pytest.approx(4.184)
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def test_different_inputs_miss(self, tmp_path):
+        extractor, client = self._make_extractor(tmp_path)
+        extractor.extract_md_settings_from_text("paper", method_hint="umbrella")
+        extractor.extract_md_settings_from_text("paper", method_hint="steered")
+        assert client.messages.create.call_count == 2
+
+    def test_disabled_by_default(self):
+        from md_agent.tools.paper_tools import MDSettingsExtractor
+
+        assert MDSettingsExtractor(MagicMock())._cache_path("t", "", None) is None
+
+
+class TestCreateConfig:
+    def test_writes_yaml_loadable_by_omegaconf(self, tmp_path):
+        from omegaconf import OmegaConf
+
+        from md_agent.tools.paper_tools import MDSettingsExtractor
+
+        extractor = MDSettingsExtractor(anthropic_client=None, cache_dir=tmp_path / "cache")
+        result = extractor.create_config_from_extracted_settings(
+            {"method": "metadynamics", "gromacs": {"dt": 0.002, "nsteps": None}, "plumed": {}},
+            str(tmp_path),
+        )
+        out = tmp_path / "reproduced_config"
+        assert sorted(p.name for p in out.iterdir()) == [
+            "config.yaml",
+            "gromacs.yaml",
+            "method.yaml",
+        ]
+        assert OmegaConf.to_container(OmegaConf.load(out / "gromacs.yaml")) == {"dt": 0.002}
+        assert OmegaConf.load(out / "method.yaml")._target_name == "metadynamics"
+        assert result["saved_files"][0] == str(out / "gromacs.yaml")
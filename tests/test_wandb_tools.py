@@ -1,9 +1,20 @@
 """Tests for WandB tools and MDMonitor."""
 
+import struct
 
 import pytest
 
-from md_agent.utils.parsers import count_hills, parse_colvar_file
+from md_agent.utils.parsers import (
+    count_hills,
+    count_new_hills,
+    get_file_mtime,
+    parse_colvar_columns,
+    parse_colvar_file,
+    parse_colvar_tail,
+    parse_edr_with_pyedr,
+    parse_gromacs_log_progress,
+    parse_gromacs_log_tail,
+)
 
 
 class TestParseColvar:
@@ -32,6 +43,49 @@ class TestParseColvar:
         rows = parse_colvar_file("/nonexistent/COLVAR")
         assert rows == []
 
+    def test_partial_trailing_line_and_restart_header(self, tmp_path):
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1\n0.0 1.0\n#! FIELDS time d1\n0.2 1.1\n0.4")
+        assert parse_colvar_file(str(colvar)) == [
+            {"time": 0.0, "d1": 1.0},
+            {"time": 0.2, "d1": 1.1},
+        ]
+
+    def test_columns(self, tmp_path):
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1\n#! SET min_d1 0\n0.0 1.0\n\n0.2 1.1\n")
+        cols = parse_colvar_columns(str(colvar))
+        assert {k: v.tolist() for k, v in cols.items()} == {"time": [0.0, 0.2], "d1": [1.0, 1.1]}
+        assert cols["d1"].flags.c_contiguous
+        assert parse_colvar_columns(str(colvar), from_line=1)["time"].tolist() == [0.2]
+        assert parse_colvar_columns(str(colvar), from_line=2) == {}
+        assert parse_colvar_columns("/nonexistent/COLVAR") == {}
+
+
+class TestParseColvarTail:
+    def test_resumes_from_offset_with_cached_fields(self, tmp_path):
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1\n0.000 1.0\n0.002 1.")  # last line incomplete
+        rows, offset, fields = parse_colvar_tail(str(colvar))
+        assert rows == [{"time": 0.0, "d1": 1.0}]
+        assert fields == ["time", "d1"]
+
+        with open(colvar, "a") as fh:
+            fh.write("1\n0.004 1.2\n")
+        rows, offset, fields = parse_colvar_tail(str(colvar), offset, fields)
+        assert [r["d1"] for r in rows] == pytest.approx([1.1, 1.2])
+        assert offset == colvar.stat().st_size
+
+    def test_replaced_file_is_read_from_start(self, tmp_path):
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d2\n0.000 5.0\n")
+        rows, offset, fields = parse_colvar_tail(str(colvar), from_offset=10_000, fields=["x"])
+        assert rows == [{"time": 0.0, "d2": 5.0}]
+        assert fields == ["time", "d2"]
+
+    def test_missing_file(self):
+        assert parse_colvar_tail("/nonexistent/COLVAR", 12, ["t"]) == ([], 12, ["t"])
+
 
 class TestCountHills:
     def test_counts_data_lines(self, tmp_path):
@@ -46,3 +100,238 @@ class TestCountHills:
 
     def test_missing_file(self):
         assert count_hills("/nonexistent/HILLS") == 0
+
+    def test_count_new_hills_from_offset(self, tmp_path):
+        hills = tmp_path / "HILLS"
+        hills.write_text("#! FIELDS time d1 sigma_d1 height biasf\n0.0 1.0 0.35 1.2 10\n")
+        new, offset = count_new_hills(str(hills))
+        assert new == 1
+
+        with open(hills, "a") as fh:
+            fh.write("#! SET min_d1 0\n1.0 1.1 0.35 1.2 10\n\n2.0 1.2 0.35 1.2 10\n3.0")
+        new, offset = count_new_hills(str(hills), offset)
+        assert new == 2
+        assert count_new_hills(str(hills), offset) == (0, offset)
+
+
+class TestLogProgress:
+    _BLOCK = "           Step           Time\n{step:>15} {time:>14.5f}\n\n   Energies (kJ/mol)\n"
+
+    def test_latest_step_from_tail(self, tmp_path):
+        log = tmp_path / "md.log"
+        body = "".join(self._BLOCK.format(step=i * 500, time=i) for i in range(2000))
+        log.write_text(body + "Performance:     12.345        1.944\n")
+        assert log.stat().st_size > 65536
+        assert parse_gromacs_log_progress(str(log)) == {
+            "step": 999500,
+            "time_ps": 1999.0,
+            "ns_per_day": 12.345,
+        }
+
+    def test_falls_back_to_full_scan(self, tmp_path):
+        log = tmp_path / "md.log"
+        log.write_text(self._BLOCK.format(step=100, time=0.2) + "x\n" * 40000)
+        assert parse_gromacs_log_progress(str(log))["step"] == 100
+        assert parse_gromacs_log_progress(str(tmp_path / "nope.log")) is None
+
+    def test_tail_reads_only_new_lines(self, tmp_path):
+        log = tmp_path / "md.log"
+        log.write_text(self._BLOCK.format(step=100, time=0.2))
+        info, offset = parse_gromacs_log_tail(str(log))
+        assert info["step"] == 100 and info["ns_per_day"] is None
+
+        with open(log, "a") as fh:
+            fh.write("Performance:     12.345        1.944\n")
+        info, offset = parse_gromacs_log_tail(str(log), offset)
+        assert info == {"step": None, "time_ps": None, "ns_per_day": 12.345}
+        assert parse_gromacs_log_tail(str(log), offset) == (None, offset)
+        with open(log, "a") as fh:
+            fh.write(self._BLOCK.format(step=200, time=0.4) + "Performance:     9.0  2.0\n")
+        info, _ = parse_gromacs_log_tail(str(log), offset)
+        assert info == {"step": 200, "time_ps": 0.4, "ns_per_day": 9.0}
+
+
+class TestFileMtime:
+    def test_cached_until_cleared(self, tmp_path):
+        path = tmp_path / "COLVAR"
+        assert get_file_mtime(str(path)) == 0.0
+        path.write_text("x")
+        assert get_file_mtime(str(path)) == 0.0  # within the TTL
+        get_file_mtime.cache_clear()
+        assert get_file_mtime(str(path)) == path.stat().st_mtime
+
+    def test_expired_entries_pruned(self, tmp_path, mocker):
+        from md_agent.utils import parsers
+
+        get_file_mtime.cache_clear()
+        clock = mocker.patch("md_agent.utils.parsers.time.monotonic", return_value=100.0)
+        for i in range(parsers._MTIME_CACHE_MAX):
+            get_file_mtime(str(tmp_path / f"f{i}"))
+        clock.return_value = 101.0
+        get_file_mtime(str(tmp_path / "new"))
+        assert list(parsers._mtime_cache) == [str(tmp_path / "new")]
+        get_file_mtime.cache_clear()
+
+
+def _xdr_string(text: str) -> bytes:
+    raw = text.encode()
+    return struct.pack(">i", len(raw)) + raw + b"\0" * (-len(raw) % 4)
+
+
+def _edr_header(names: list[str]) -> bytes:
+    """Single-precision, version-5 EDR preamble (energy names + units)."""
+    out = struct.pack(">iii", -55555, 5, len(names))
+    for name in names:
+        out += _xdr_string(name) + _xdr_string("kJ/mol")
+    return out
+
+
+def _edr_frame(step: int, values: list[float]) -> bytes:
+    out = struct.pack(">fii", -2e10, -7777777, 5)  # first_real, frame magic, version
+    out += struct.pack(">dqiqd", step * 0.002, step, 0, 1, 0.002)  # t, step, nsum, nsteps, dt
+    out += struct.pack(">iiiiii", len(values), 0, 0, 0, 0, 0)  # nre, _, nblock, e_size, _, _
+    return out + struct.pack(f">{len(values)}f", *values)
+
+
+class TestParseEdr:
+    def test_reads_terms_by_step(self, tmp_path):
+        edr = tmp_path / "md.edr"
+        edr.write_bytes(
+            _edr_header(["Potential", "Temperature"])
+            + _edr_frame(0, [-100.0, 300.0])
+            + _edr_frame(500, [-110.0, 301.0])
+        )
+        data, offset, _ = parse_edr_with_pyedr(str(edr), ["Temperature", "Missing"], from_step=-1)
+        assert data == [(0, {"Temperature": 300.0}), (500, {"Temperature": 301.0})]
+        assert offset == edr.stat().st_size
+
+    def test_offset_bookmark_resumes_after_partial_frame(self, tmp_path):
+        edr = tmp_path / "md.edr"
+        header = _edr_header(["Potential"])
+        first, second = _edr_frame(100, [-1.0]), _edr_frame(200, [-2.0])
+        edr.write_bytes(header + first + second[:10])  # second frame half-written
+
+        data, offset, cache = parse_edr_with_pyedr(str(edr), ["Potential"])
+        assert [step for step, _ in data] == [100]
+        assert offset == len(header + first)
+
+        edr.write_bytes(header + first + second)
+        data, offset, cached = parse_edr_with_pyedr(
+            str(edr), ["Potential"], from_offset=offset, header_cache=cache
+        )
+        assert data == [(200, {"Potential": -2.0})]
+        assert offset == edr.stat().st_size
+        assert cached is cache
+
+    def test_replaced_file_rereads_header(self, tmp_path):
+        old, new = tmp_path / "old.edr", tmp_path / "md.edr"
+        old.write_bytes(_edr_header(["Potential"]) + _edr_frame(100, [-1.0]))
+        _, offset, header = parse_edr_with_pyedr(str(old), ["Potential"])
+
+        new.write_bytes(
+            _edr_header(["Pressure", "Potential"])
+            + _edr_frame(0, [1.0, -5.0])
+            + _edr_frame(10, [1.0, -6.0])
+        )
+        data, _, cached = parse_edr_with_pyedr(
+            str(new), ["Potential"], from_step=-1, from_offset=offset, header_cache=header
+        )
+        assert data == [(0, {"Potential": -5.0}), (10, {"Potential": -6.0})]
+        assert cached is not header and cached.index == {"Pressure": 0, "Potential": 1}
+
+    def test_missing_or_truncated_header(self, tmp_path):
+        assert parse_edr_with_pyedr(str(tmp_path / "nope.edr"), ["Potential"]) == ([], 0, None)
+        edr = tmp_path / "md.edr"
+        edr.write_bytes(_edr_header(["Potential"])[:6])
+        assert parse_edr_with_pyedr(str(edr), ["Potential"], from_offset=7) == ([], 7, None)
+
+
+class TestLogColvar:
+    def test_logs_one_record_per_row(self, tmp_path, mocker):
+        from md_agent.tools.wandb_tools import wandb_log_colvar
+
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1 phi\n0.0 0.5 -1.0\n1.0 0.7 -1.1\n2.0 0.9 -1.2\n")
+        log = mocker.patch("md_agent.tools.wandb_tools.wandb.log")
+
+        assert wandb_log_colvar(str(colvar), from_step=1, dt=0.5) == {"logged_rows": 2}
+        assert [c.args[0] for c in log.call_args_list] == [
+            {"md_step": 2, "time_ps": 1.0, "d1": 0.7, "phi": -1.1},
+            {"md_step": 4, "time_ps": 2.0, "d1": 0.9, "phi": -1.2},
+        ]
+        assert wandb_log_colvar(str(tmp_path / "missing")) == {"logged_rows": 0}
+
+
+class TestMonitorPoll:
+    def test_rows_sharing_a_step_are_logged_once(self, tmp_path, mocker):
+        from md_agent.tools.wandb_tools import MDMonitor
+
+        edr = tmp_path / "md.edr"
+        edr.write_bytes(
+            _edr_header(["Potential"]) + _edr_frame(500, [-1.0]) + _edr_frame(1000, [-2.0])
+        )
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1\n1.000 0.5\n3.000 0.7\n")
+        hills = tmp_path / "HILLS"
+        hills.write_text("#! FIELDS time d1\n1.0 0.5\n")
+        log = mocker.patch("md_agent.tools.wandb_tools.wandb.log")
+
+        monitor = MDMonitor(
+            log_file=str(tmp_path / "md.log"),
+            edr_file=str(edr),
+            colvar_file=str(colvar),
+            hills_file=str(hills),
+            energy_terms=["Potential"],
+        )
+        monitor._do_poll()
+
+        assert [c.args[0] for c in log.call_args_list] == [
+            {"md_step": 500, "Potential": -1.0, "time_ps": 1.0, "d1": 0.5},
+            {"md_step": 1000, "Potential": -2.0},
+            {"md_step": 1500, "time_ps": 3.0, "d1": 0.7},
+            {"hills_deposited": 1},
+        ]
+
+    def test_colvar_rows_are_never_merged_away(self, tmp_path, mocker):
+        from md_agent.tools.wandb_tools import MDMonitor
+
+        colvar = tmp_path / "COLVAR"
+        # 0.086 / 0.002 == 42.99999999999999; a restart repeats t = 0.086
+        colvar.write_text("#! FIELDS time d1\n0.084 0.1\n0.086 0.2\n0.086 0.3\n")
+        log = mocker.patch("md_agent.tools.wandb_tools.wandb.log")
+
+        monitor = MDMonitor(
+            log_file=str(tmp_path / "md.log"),
+            edr_file=str(tmp_path / "md.edr"),
+            colvar_file=str(colvar),
+        )
+        monitor._do_poll()
+
+        assert [c.args[0] for c in log.call_args_list] == [
+            {"md_step": 42, "time_ps": 0.084, "d1": 0.1},
+            {"md_step": 43, "time_ps": 0.086, "d1": 0.2},
+            {"md_step": 43, "time_ps": 0.086, "d1": 0.3},
+        ]
+
+    def test_file_change_wakes_monitor(self, tmp_path):
+        pytest.importorskip("watchdog")
+        from md_agent.tools.wandb_tools import MDMonitor
+
+        colvar = tmp_path / "COLVAR"
+        colvar.write_text("#! FIELDS time d1\n")
+        monitor = MDMonitor(
+            log_file=str(tmp_path / "md.log"),
+            edr_file=str(tmp_path / "md.edr"),
+            colvar_file=str(colvar),
+        )
+        monitor._observer = monitor._start_observer()
+        try:
+            assert monitor._observer is not None
+            (tmp_path / "unrelated.txt").write_text("x")
+            assert not monitor._changed.wait(timeout=0.5)
+            with open(colvar, "a") as fh:
+                fh.write("0.0 1.0\n")
+            assert monitor._changed.wait(timeout=5)
+        finally:
+            monitor._observer.stop()
+            monitor._observer.join()
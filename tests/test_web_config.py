@@ -4,7 +4,7 @@
 import pytest
 from omegaconf import OmegaConf
 
-from web.backend.routers.config import _build_plumed_content, _resolve_cvs
+from web.backend.routers.config import _build_plumed_content, _list_group, _resolve_cvs
 
 
 @pytest.fixture
@@ -214,3 +214,23 @@ class TestBuildPlumedContent:
         assert "d1: DISTANCE" in content
         assert "METAD" not in content
         assert "OPES" not in content
+
+
+class TestListGroup:
+    def test_relisted_only_when_dir_changes(self, tmp_path):
+        import os
+
+        (tmp_path / "b.yaml").write_text("")
+        (tmp_path / "a.yaml").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        assert _list_group(tmp_path) == ["a", "b"]
+
+        mtime = tmp_path.stat().st_mtime_ns
+        (tmp_path / "c.yaml").write_text("")
+        os.utime(tmp_path, ns=(mtime, mtime))  # pretend the dir is unchanged
+        assert _list_group(tmp_path) == ["a", "b"]
+        os.utime(tmp_path, ns=(mtime + 1, mtime + 1))
+        assert _list_group(tmp_path) == ["a", "b", "c"]
+
+    def test_missing_dir(self, tmp_path):
+        assert _list_group(tmp_path / "nope") == []
@@ -10,6 +10,7 @@ from web.backend.session_manager import (
     get_session,
     infer_run_status_from_disk,
     list_sessions,
+    watch_mdrun,
 )
 
 
@@ -55,6 +56,89 @@ class TestSessionStore:
         assert result is not None
         assert result.nickname == "test"
 
+    def test_concurrent_mutation_and_listing(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        for i in range(200):
+            _sessions[f"s{i}"] = Session(session_id=f"s{i}", work_dir=f"/tmp/s{i}")
+
+        def churn(i):
+            get_session(f"s{(i * 7) % 200}")  # move_to_end
+            delete_session(f"s{i}")
+            return len(list_sessions())
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(churn, range(200)))
+        assert list_sessions() == []
+
+
+class TestLoadHydraCfg:
+    def test_composes_once_per_overrides(self):
+        from web.backend import session_manager as sm
+
+        sm._compose_cfg.cache_clear()
+        a = sm._load_hydra_cfg(["method=metadynamics"], "/tmp/a")
+        b = sm._load_hydra_cfg(["method=metadynamics"], "/tmp/b")
+        assert sm._compose_cfg.cache_info().misses == 1
+        assert (a.run.work_dir, b.run.work_dir) == ("/tmp/a", "/tmp/b")
+        a.method.nsteps = 5
+        assert b.method.nsteps != 5
+
+
+class TestGetOrRestore:
+    def test_restores_from_index_without_scanning(self, tmp_path, mocker):
+        from pathlib import Path
+
+        from web.backend import session_manager as sm
+
+        row = {"status": "active", "work_dir": str(tmp_path), "nickname": "n", "username": "u"}
+        mocker.patch("web.backend.db.get_session_indexed", return_value=row)
+        restore = mocker.patch.object(sm, "restore_session", return_value="restored")
+        rglob = mocker.spy(Path, "rglob")
+
+        assert sm.get_or_restore_session("s1") == "restored"
+        restore.assert_called_once_with(
+            session_id="s1", work_dir=str(tmp_path), nickname="n", username="u"
+        )
+        rglob.assert_not_called()
+
+
+class TestWatchMdrun:
+    def test_exit_code_recorded_without_polling(self, mocker):
+        import subprocess
+        import sys
+        import threading
+
+        from web.backend.session_manager import _returncode
+
+        proc = subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"])
+        session = Session(session_id="s1", work_dir="/tmp/s1")
+        poll = mocker.spy(proc, "poll")
+        watch_mdrun(session, proc)
+        watcher = next(t for t in threading.enumerate() if t.name == "mdrun-watch-s1")
+        watcher.join(timeout=10)
+        assert _returncode(session, proc) == 3
+        poll.assert_not_called()
+
+
+class TestStartWhileRunning:
+    def test_second_start_is_rejected(self, mocker):
+        import asyncio
+
+        from fastapi import HTTPException
+
+        from web.backend.routers import simulate
+
+        _sessions["s1"] = Session(session_id="s1", work_dir="/tmp/s1")
+        mocker.patch.object(
+            simulate, "get_simulation_status", return_value={"running": True, "status": "running"}
+        )
+        launch = mocker.patch.object(simulate, "_start_simulation")
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(simulate.start_simulation("s1"))
+        assert exc.value.status_code == 409
+        launch.assert_not_called()
+
 
 class TestInferRunStatus:
     def test_no_log_returns_none(self, tmp_path):
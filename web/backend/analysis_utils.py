@@ -5,15 +5,15 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
-import math
 import re
+import warnings
 from pathlib import Path
 from typing import Any
 
 log = logging.getLogger(__name__)
 
 from md_agent.utils.parsers import (  # noqa: E402
-    parse_colvar_file,
+    parse_colvar_columns,
     parse_gromacs_log_progress,
 )
 
@@ -116,7 +116,7 @@ def _save_energy_npy(data: dict[str, list], analysis_dir: Path) -> None:
         log.warning("Failed to save energy .npy cache: %s", exc)
 
 
-def _load_energy_npy(analysis_dir: Path) -> dict[str, list] | None:
+def _load_energy_npy(analysis_dir: Path) -> dict[str, Any] | None:
     """Load energy data from cached .npy files. Returns None if cache is missing."""
     cols_path = analysis_dir / "energy_columns.json"
     if not cols_path.exists():
@@ -125,13 +125,13 @@ def _load_energy_npy(analysis_dir: Path) -> dict[str, list] | None:
         import numpy as np
 
         columns = json.loads(cols_path.read_text())
-        data: dict[str, list] = {}
+        data: dict[str, Any] = {}
         for key in columns:
             safe_name = key.lower().replace(" ", "_").replace("-", "_").replace(".", "")
             npy_path = analysis_dir / f"energy_{safe_name}.npy"
             if not npy_path.exists():
                 return None
-            data[key] = np.load(str(npy_path)).tolist()
+            data[key] = np.load(str(npy_path))
         return data if data else None
     except Exception:
         return None
@@ -143,7 +143,7 @@ def run_gmx_energy(
     edr_rel: str = "simulation/md.edr",
     xvg_rel: str = "analysis/energy.xvg",
     force: bool = False,
-) -> dict[str, list]:
+) -> dict[str, Any]:
     """Run 'gmx energy' to extract timeseries from .edr, caching as .npy + .xvg.
 
     Returns parsed {time_ps, term_name, ...} dict or {} on failure.
@@ -208,18 +208,12 @@ def run_gmx_energy(
     return data
 
 
-def colvar_to_columns(colvar_path: str) -> dict[str, list[float]]:
-    """Parse COLVAR file and transpose rows → column arrays for Plotly."""
-    rows = parse_colvar_file(colvar_path)
-    if not rows:
-        return {}
-    keys = list(rows[0].keys())
-    # Single-pass transpose instead of K separate iterations
-    columns: dict[str, list[float]] = {k: [] for k in keys}
-    for r in rows:
-        for k in keys:
-            columns[k].append(r[k])
-    return columns
+def colvar_to_columns(colvar_path: str) -> dict[str, Any]:
+    """Parse COLVAR file into column arrays for Plotly.
+
+    Columns stay as ndarrays; the analysis router serializes them with orjson.
+    """
+    return parse_colvar_columns(colvar_path)
 
 
 def fes_dat_to_heatmap(fes_path: str) -> dict[str, Any]:
@@ -232,15 +226,35 @@ def fes_dat_to_heatmap(fes_path: str) -> dict[str, Any]:
         ...
         (blank line between phi blocks)
 
-    Returns {"x": [...unique phi...], "y": [...unique psi...], "z": [[...]]}
+    Returns {"x": unique phi, "y": unique psi, "z": 2-D grid} as ndarrays.
     """
     if not Path(fes_path).exists():
         return {}
 
-    x_vals: list[float] = []
-    y_vals: list[float] = []
-    z_vals: list[float] = []
+    import numpy as np
 
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # "input contained no data"
+            data = np.loadtxt(fes_path, comments="#", usecols=(0, 1, 2), ndmin=2)
+    except ValueError:
+        # Ragged or partly written file: keep the rows that parse
+        data = np.array(_fes_rows_slow(fes_path), dtype=np.float64).reshape(-1, 3)
+
+    if not len(data):
+        return {}
+
+    # Unique sorted axis values; the inverse indices place each z in the grid
+    unique_x, ix = np.unique(data[:, 0], return_inverse=True)
+    unique_y, iy = np.unique(data[:, 1], return_inverse=True)
+    z_matrix = np.full((unique_y.size, unique_x.size), np.nan)
+    z_matrix[iy, ix] = data[:, 2]
+
+    return {"x": unique_x, "y": unique_y, "z": z_matrix}
+
+
+def _fes_rows_slow(fes_path: str) -> list[list[float]]:
+    rows: list[list[float]] = []
     with open(fes_path) as fh:
         for line in fh:
             stripped = line.strip()
@@ -249,30 +263,10 @@ def fes_dat_to_heatmap(fes_path: str) -> dict[str, Any]:
             parts = stripped.split()
             if len(parts) >= 3:
                 try:
-                    x_vals.append(float(parts[0]))
-                    y_vals.append(float(parts[1]))
-                    z_vals.append(float(parts[2]))
+                    rows.append([float(parts[0]), float(parts[1]), float(parts[2])])
                 except ValueError:
                     pass
-
-    if not x_vals:
-        return {}
-
-    # Build unique sorted axis values
-    unique_x = sorted(set(x_vals))
-    unique_y = sorted(set(y_vals))
-
-    # Build 2D z matrix: z[i_y][i_x]
-    x_idx = {v: i for i, v in enumerate(unique_x)}
-    y_idx = {v: i for i, v in enumerate(unique_y)}
-    z_matrix = [[math.nan] * len(unique_x) for _ in range(len(unique_y))]
-    for xi, yi, zi in zip(x_vals, y_vals, z_vals):
-        ix = x_idx.get(xi)
-        iy = y_idx.get(yi)
-        if ix is not None and iy is not None:
-            z_matrix[iy][ix] = zi
-
-    return {"x": unique_x, "y": unique_y, "z": z_matrix}
+    return rows
 
 
 def _load_trajectory(wd: Path):
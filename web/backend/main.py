@@ -11,10 +11,16 @@ if not os.environ.get("ANTHROPIC_API_KEY"):
 
     warnings.warn("ANTHROPIC_API_KEY is not set — agent calls will fail", stacklevel=1)
 
-# Allow imports of both web.backend.* and md_agent.* when running directly
-_repo_root = str(Path(__file__).parents[2])
-if _repo_root not in sys.path:
-    sys.path.insert(0, _repo_root)
+# Allow imports of both web.backend.* and md_agent.* when running directly.
+# Skip the sys.path prefix (an extra stat on every later import) when the
+# packages are already importable, e.g. after `pip install -e .`.
+try:
+    import md_agent  # noqa: F401
+    import web  # noqa: F401
+except ImportError:
+    _repo_root = str(Path(__file__).parents[2])
+    if _repo_root not in sys.path:
+        sys.path.insert(0, _repo_root)
 
 from fastapi import FastAPI, Request  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
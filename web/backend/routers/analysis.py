@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
+from md_agent.utils.json_utils import dumpb
 from web.backend.analysis_utils import (
     _load_energy_npy,
     _parse_xvg_with_header,
@@ -25,8 +27,19 @@ router = APIRouter()
 MAX_PLOT_POINTS = 5000
 
 
-def _downsample(data: dict[str, list], max_points: int = MAX_PLOT_POINTS) -> dict[str, list]:
-    """Evenly downsample all columns to at most max_points entries."""
+class PlotResponse(JSONResponse):
+    """JSON response encoded by orjson.
+
+    Returned directly from the plot endpoints so FastAPI skips its pure-Python
+    ``jsonable_encoder`` pass; NumPy arrays serialize natively and NaN becomes null.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
+
+
+def _downsample(data: dict[str, Any], max_points: int = MAX_PLOT_POINTS) -> dict[str, Any]:
+    """Evenly downsample all columns (lists or ndarrays) to at most max_points entries."""
     if not data:
         return data
     n = len(next(iter(data.values())))
@@ -63,8 +76,8 @@ async def get_colvar(
     """Parse COLVAR and return column arrays for Plotly line/scatter charts."""
     session = _require_session(session_id)
     path = str(Path(session.work_dir) / filename)
-    data = _downsample(colvar_to_columns(path), max_points)
-    return {"data": data, "available": bool(data)}
+    data = _downsample(await asyncio.to_thread(colvar_to_columns, path), max_points)
+    return PlotResponse({"data": data, "available": bool(data)})
 
 
 @router.get("/sessions/{session_id}/analysis/fes")
@@ -72,8 +85,8 @@ async def get_fes(session_id: str, filename: str = "fes.dat"):
     """Parse plumed sum_hills FES file → {x, y, z} for Plotly heatmap (Ramachandran)."""
     session = _require_session(session_id)
     path = str(Path(session.work_dir) / filename)
-    data = fes_dat_to_heatmap(path)
-    return {"data": data, "available": bool(data)}
+    data = await asyncio.to_thread(fes_dat_to_heatmap, path)
+    return PlotResponse({"data": data, "available": bool(data)})
 
 
 @router.get("/sessions/{session_id}/analysis/energy")
@@ -96,16 +109,20 @@ async def get_energy(
 
     # Serve from cached .npy files (fastest)
     if not force:
-        npy_data = _load_energy_npy(analysis_dir)
+        npy_data = await asyncio.to_thread(_load_energy_npy, analysis_dir)
         if npy_data:
-            return {"data": _downsample(npy_data, max_points), "available": True, "source": "cache"}
+            return PlotResponse(
+                {"data": _downsample(npy_data, max_points), "available": True, "source": "cache"}
+            )
 
     # Serve from cached XVG
     xvg_path = analysis_dir / "energy.xvg"
     if not force and xvg_path.exists() and xvg_path.stat().st_size > 0:
-        data = _parse_xvg_with_header(str(xvg_path))
+        data = await asyncio.to_thread(_parse_xvg_with_header, str(xvg_path))
         if data:
-            return {"data": _downsample(data, max_points), "available": True, "source": "cache"}
+            return PlotResponse(
+                {"data": _downsample(data, max_points), "available": True, "source": "cache"}
+            )
 
     # No cache — only run gmx energy if explicitly requested
     if not extract and not force:
@@ -123,8 +140,10 @@ async def get_energy(
         gmx = session.agent._gmx
     except AttributeError:
         return {"data": {}, "available": False, "source": "error"}
-    data = run_gmx_energy(session.work_dir, gmx, force=force)
-    return {"data": _downsample(data, max_points), "available": bool(data), "source": "extracted"}
+    data = await asyncio.to_thread(run_gmx_energy, session.work_dir, gmx, force=force)
+    return PlotResponse(
+        {"data": _downsample(data, max_points), "available": bool(data), "source": "extracted"}
+    )
 
 
 @router.get("/sessions/{session_id}/analysis/ramachandran")
@@ -138,13 +157,12 @@ async def get_ramachandran(session_id: str, force: bool = Query(default=False)):
         try:
             import numpy as np
 
-            return {
-                "data": {
-                    "phi": np.load(str(phi_npy)).tolist(),
-                    "psi": np.load(str(psi_npy)).tolist(),
-                },
-                "available": True,
-            }
+            return PlotResponse(
+                {
+                    "data": {"phi": np.load(str(phi_npy)), "psi": np.load(str(psi_npy))},
+                    "available": True,
+                }
+            )
         except Exception:
             pass
     # Trigger full pipeline to extract + save .npy
@@ -154,13 +172,12 @@ async def get_ramachandran(session_id: str, force: bool = Query(default=False)):
     try:
         import numpy as np
 
-        return {
-            "data": {
-                "phi": np.load(str(phi_npy)).tolist(),
-                "psi": np.load(str(psi_npy)).tolist(),
-            },
-            "available": True,
-        }
+        return PlotResponse(
+            {
+                "data": {"phi": np.load(str(phi_npy)), "psi": np.load(str(psi_npy))},
+                "available": True,
+            }
+        )
     except Exception:
         return {"data": {}, "available": False}
 
@@ -191,7 +208,7 @@ async def get_progress(session_id: str, filename: str = "simulation/md.log"):
     """Return latest simulation progress from GROMACS log."""
     session = _require_session(session_id)
     path = str(Path(session.work_dir) / filename)
-    info = get_log_progress(path)
+    info = await asyncio.to_thread(get_log_progress, path)
     return {"progress": info, "available": bool(info)}
 
 
@@ -218,7 +235,9 @@ async def compute_custom_cv(session_id: str, req: CustomCVRequest):
         from web.backend.analysis_utils import compute_custom_cvs
 
         cvs_dicts = [{"type": cv.type, "atoms": cv.atoms, "label": cv.label} for cv in req.cvs]
-        data = compute_custom_cvs(str(session.work_dir), cvs_dicts, force=req.force)
+        data = await asyncio.to_thread(
+            compute_custom_cvs, str(session.work_dir), cvs_dicts, force=req.force
+        )
         return {"data": data, "available": True}
     except Exception as e:
         return {"data": {}, "available": False, "error": str(e)}
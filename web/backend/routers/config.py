@@ -18,22 +18,33 @@ _DATA_MOLECULES = Path(__file__).parents[4] / "data" / "molecule"
 _MOL_EXTS = {".pdb", ".gro", ".mol2", ".xyz", ".sdf"}
 
 
+# Config group dir -> (dir mtime_ns, option names); re-listed only when the dir changes
+_options_cache: dict[Path, tuple[int, list[str]]] = {}
+
+
+def _list_group(d: Path) -> list[str]:
+    """Return the sorted ``*.yaml`` stems in config group dir *d* ([] if missing)."""
+    try:
+        mtime = d.stat().st_mtime_ns
+    except OSError:
+        return []
+    cached = _options_cache.get(d)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    names = [f.stem for f in sorted(d.glob("*.yaml"))]
+    _options_cache[d] = (mtime, names)
+    return names
+
+
 @router.get("/config/options")
 async def get_config_options():
     """Return available Hydra config group options."""
     conf_dir = Path(_repo_conf_dir())
-
-    def list_group(subdir: str) -> list[str]:
-        d = conf_dir / subdir
-        if not d.is_dir():
-            return []
-        return [f.stem for f in sorted(d.glob("*.yaml"))]
-
     return {
-        "methods": list_group("method"),
-        "systems": list_group("system"),
-        "gromacs": list_group("gromacs"),
-        "plumed_cvs": list_group("plumed/collective_variables"),
+        "methods": _list_group(conf_dir / "method"),
+        "systems": _list_group(conf_dir / "system"),
+        "gromacs": _list_group(conf_dir / "gromacs"),
+        "plumed_cvs": _list_group(conf_dir / "plumed/collective_variables"),
     }
 
 
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
+import os
 import re
 import shutil
 import zipfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
 
 import httpx
 from fastapi import APIRouter, Body, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from md_agent.utils.file_utils import list_files
@@ -18,6 +22,10 @@ from web.backend.session_manager import get_or_restore_session
 
 router = APIRouter()
 
+_COPY_CHUNK = 1 << 20
+# Downloads up to this size are served from an in-memory snapshot.
+_SNAPSHOT_MAX = 64 << 20
+
 
 def _session_root(work: Path) -> Path:
     """Return session root for a work dir (typically .../<session>/data)."""
@@ -84,9 +92,15 @@ async def upload_file(session_id: str, file: UploadFile):
         raise HTTPException(404, "Session not found")
     dest = Path(session.work_dir) / (file.filename or "upload")
     dest.parent.mkdir(parents=True, exist_ok=True)
-    content = await file.read()
-    dest.write_bytes(content)
-    return {"saved_path": str(dest), "size_bytes": len(content)}
+    size = await asyncio.to_thread(_save_upload, file.file, dest)
+    return {"saved_path": str(dest), "size_bytes": size}
+
+
+def _save_upload(src: BinaryIO, dest: Path) -> int:
+    """Copy an upload to *dest* in 1 MiB chunks; returns the number of bytes written."""
+    with open(dest, "wb") as out:
+        shutil.copyfileobj(src, out, length=_COPY_CHUNK)
+        return out.tell()
 
 
 @router.get("/sessions/{session_id}/files/download")
@@ -100,20 +114,33 @@ async def download_file(session_id: str, path: str):
         raise HTTPException(403, "Path outside session work directory")
     if not target.exists():
         raise HTTPException(404, "File not found")
-    # Read the file content as a snapshot to avoid Content-Length mismatch
-    # when GROMACS is actively writing to the file.
     import mimetypes
 
-    content = target.read_bytes()
     media_type = mimetypes.guess_type(str(target))[0] or "application/octet-stream"
-    return StreamingResponse(
-        iter([content]),
-        media_type=media_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{target.name}"',
-            "Content-Length": str(len(content)),
-        },
-    )
+    headers = {"Content-Disposition": f'attachment; filename="{target.name}"'}
+    # GROMACS may be appending to or replacing the file. Size the response from
+    # the handle we serve, so a rename or backup cannot swap the file under us.
+    fh = open(target, "rb")
+    size = os.fstat(fh.fileno()).st_size
+    if size <= _SNAPSHOT_MAX:
+        # Snapshot: a truncate mid-download cannot cut the body short
+        with fh:
+            content = await asyncio.to_thread(fh.read, size)
+        return Response(content, media_type=media_type, headers=headers)
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(_iter_file(fh, size), media_type=media_type, headers=headers)
+
+
+def _iter_file(fh: BinaryIO, size: int) -> Iterator[bytes]:
+    """Yield the first *size* bytes of *fh* in 1 MiB chunks, then close it."""
+    with fh:
+        remaining = size
+        while remaining > 0:
+            chunk = fh.read(min(_COPY_CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
 
 @router.delete("/sessions/{session_id}/files")
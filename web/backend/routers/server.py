@@ -149,10 +149,12 @@ def _session_gpu_map() -> dict[int, dict]:
         gpu_pids.setdefault(p["gpu_index"], []).append(p["pid"])
 
     # Scan session.json files to match PIDs
-    from web.backend.session_manager import _sessions
+    from web.backend.session_manager import _sessions, _sessions_lock
 
+    with _sessions_lock:
+        in_memory = list(_sessions.items())
     pid_to_session: dict[int, dict] = {}
-    for sid, session in _sessions.items():
+    for sid, session in in_memory:
         sim = session.sim_status or {}
         pid = sim.get("pid")
         if pid:
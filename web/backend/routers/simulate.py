@@ -2,17 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import shutil
 import subprocess
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
 from omegaconf import OmegaConf
 
-from web.backend.session_manager import get_session
+from md_agent.config.hydra_utils import generate_mdp_from_config
+from web.backend.session_manager import (
+    Session,
+    get_session,
+    get_simulation_status,
+    stop_session_simulation,
+    watch_mdrun,
+)
 
 router = APIRouter()
 
@@ -44,7 +53,7 @@ def _auto_detect_gpu() -> str | None:
     return None
 
 
-_COORD_EXTS = {".gro", ".pdb"}
+_COORD_EXTS = frozenset({".gro", ".pdb"})
 
 
 def _persist_run_status(session: object, status: str) -> None:
@@ -93,7 +102,7 @@ def _persist_run_status(session: object, status: str) -> None:
         pass
 
 
-_TOP_EXTS = {".top"}
+_TOP_EXTS = frozenset({".top"})
 
 # Subfolder within work_dir where mdrun writes its output files
 _SIM_SUBDIR = "simulation"
@@ -117,13 +126,28 @@ def _remove_existing(work_dir: Path, *names: str) -> None:
                 pass
 
 
-def _find_file(work_dir: Path, extensions: set[str], preferred: str = "") -> str | None:
+def _find_file(
+    work_dir: Path,
+    extensions: frozenset[str],
+    preferred: str = "",
+    exclude: Callable[[str], bool] | None = None,
+) -> str | None:
+    """Return *preferred* if present, else the alphabetically first file with a matching suffix."""
     if preferred and (work_dir / preferred).exists():
         return preferred
-    for f in sorted(work_dir.iterdir()):
-        if f.is_file() and f.suffix.lower() in extensions:
-            return f.name
-    return None
+    best: str | None = None
+    # One pass, no sort; DirEntry.is_file() answers from the dirent type, so
+    # only symlinks cost a stat.
+    with os.scandir(work_dir) as it:
+        for entry in it:
+            name = entry.name
+            if best is not None and name >= best:
+                continue
+            if os.path.splitext(name)[1].lower() not in extensions:
+                continue
+            if (exclude is None or not exclude(name)) and entry.is_file():
+                best = name
+    return best
 
 
 def _is_derived_coord(name: str) -> bool:
@@ -155,15 +179,7 @@ def _find_source_coord(work_dir: Path, preferred: str = "") -> str | None:
                     if (work_dir / cand).exists() and not _is_derived_coord(cand):
                         return cand
                 break
-    for f in sorted(work_dir.iterdir()):
-        if not f.is_file():
-            continue
-        if f.suffix.lower() not in _COORD_EXTS:
-            continue
-        if _is_derived_coord(f.name):
-            continue
-        return f.name
-    return None
+    return _find_file(work_dir, _COORD_EXTS, exclude=_is_derived_coord)
 
 
 def _remove_matching(work_dir: Path, *patterns: str) -> None:
@@ -197,7 +213,20 @@ async def start_simulation(session_id: str):
     session = get_session(session_id)
     if not session:
         raise HTTPException(404, "Session not found")
+    # One launch at a time per session: a double click must not run two
+    # pdb2gmx/grompp pipelines over the same files.
+    async with session.lock:
+        _ensure_not_running(session_id)
+        return await _start_simulation(session)
+
+
+def _ensure_not_running(session_id: str) -> None:
+    """Raise 409 if mdrun is still alive: a second run would race on the same outputs."""
+    if get_simulation_status(session_id).get("running"):
+        raise HTTPException(409, "Simulation already running for this session")
 
+
+async def _start_simulation(session: Session) -> dict:
     # Status is NOT set to "running" here — it is only set after mdrun actually starts.
     # Any preparation failure will set status to "failed" via the except block below.
 
@@ -211,9 +240,7 @@ async def start_simulation(session_id: str):
 
     try:
         # 1. Generate md.mdp from current config
-        from md_agent.config.hydra_utils import generate_mdp_from_config
-
-        generate_mdp_from_config(cfg, str(work_dir / "md.mdp"))
+        await asyncio.to_thread(generate_mdp_from_config, cfg, str(work_dir / "md.mdp"))
 
         # 2. Find the raw input coordinate file (the original PDB/GRO the user uploaded)
         preferred_coord = OmegaConf.select(cfg, "system.coordinates") or ""
@@ -256,7 +283,7 @@ async def start_simulation(session_id: str):
                 work_dir=str(work_dir),
             )
 
-        result = _run_pdb2gmx(forcefield)
+        result = await asyncio.to_thread(_run_pdb2gmx, forcefield)
 
         # Fall back to amber99sb-ildn if the chosen FF lacks the residue
         if result["returncode"] != 0:
@@ -265,11 +292,9 @@ async def start_simulation(session_id: str):
                 "not found in residue topology database" in stderr
                 and forcefield != "amber99sb-ildn"
             ):
-                result = _run_pdb2gmx("amber99sb-ildn")
+                result = await asyncio.to_thread(_run_pdb2gmx, "amber99sb-ildn")
                 if result["returncode"] == 0:
-                    from omegaconf import OmegaConf as _OC
-
-                    _OC.update(cfg, "system.forcefield", "amber99sb-ildn", merge=True)
+                    OmegaConf.update(cfg, "system.forcefield", "amber99sb-ildn", merge=True)
                     forcefield = "amber99sb-ildn"
 
         if result["returncode"] != 0:
@@ -288,11 +313,14 @@ async def start_simulation(session_id: str):
             _archive_existing(work_dir, ionized_gro, solvated_gro, box_gro, "ions.tpr")
             _remove_existing(work_dir, ionized_gro, solvated_gro, box_gro, "ions.tpr", "mdout.mdp")
 
-            # B1. Add simulation box using configured clearance
+            # B1-B3 run as one pipeline (one container under Docker):
+            #   editconf adds the box using the configured clearance,
+            #   solvate fills it with water,
+            #   grompp → ions.tpr (net-charge warning expected; genion will fix it)
             box_type = str(OmegaConf.select(cfg, "gromacs.box_type") or "cubic")
-            r = gmx.run_gmx_command(
-                "editconf",
+            steps = [
                 [
+                    "editconf",
                     "-f",
                     system_gro,
                     "-o",
@@ -303,33 +331,41 @@ async def start_simulation(session_id: str):
                     "-bt",
                     box_type,
                 ],
-                work_dir=str(work_dir),
-            )
-            if r["returncode"] != 0:
-                raise HTTPException(500, f"editconf failed:\n{r.get('stderr', '')[-2000:]}")
-
-            # B2. Fill with water
-            r = gmx.run_gmx_command(
-                "solvate",
-                ["-cp", box_gro, "-cs", "spc216.gro", "-o", solvated_gro, "-p", "topol.top"],
-                work_dir=str(work_dir),
-            )
-            if r["returncode"] != 0:
-                raise HTTPException(500, f"solvate failed:\n{r.get('stderr', '')[-2000:]}")
-
-            # B3. grompp → ions.tpr (net-charge warning expected; genion will fix it)
-            r = gmx.grompp(
-                mdp_file="md.mdp",
-                topology_file="topol.top",
-                coordinate_file=solvated_gro,
-                output_tpr="ions.tpr",
-                max_warnings=20,
-            )
+                [
+                    "solvate",
+                    "-cp",
+                    box_gro,
+                    "-cs",
+                    "spc216.gro",
+                    "-o",
+                    solvated_gro,
+                    "-p",
+                    "topol.top",
+                ],
+                [
+                    "grompp",
+                    "-f",
+                    "md.mdp",
+                    "-p",
+                    "topol.top",
+                    "-c",
+                    solvated_gro,
+                    "-o",
+                    "ions.tpr",
+                    "-maxwarn",
+                    "20",
+                ],
+            ]
+            r = await asyncio.to_thread(gmx.run_gmx_pipeline, steps, work_dir=str(work_dir))
             if not r["success"]:
-                raise HTTPException(500, f"grompp (ions) failed:\n{r.get('stderr', '')[-2000:]}")
+                names = ("editconf", "solvate", "grompp (ions)")
+                failed = r["failed_step"]
+                step = names[failed] if failed is not None else "editconf/solvate/grompp (ions)"
+                raise HTTPException(500, f"{step} failed:\n{r.get('stderr', '')[-2000:]}")
 
             # B4. Replace water molecules with Na+/Cl- to neutralise
-            r = gmx.run_gmx_command(
+            r = await asyncio.to_thread(
+                gmx.run_gmx_command,
                 "genion",
                 [
                     "-s",
@@ -357,7 +393,8 @@ async def start_simulation(session_id: str):
             _archive_existing(work_dir, box_gro)
             _remove_existing(work_dir, box_gro)
             _src = system_gro if (work_dir / system_gro).exists() else input_coord
-            r = gmx.run_gmx_command(
+            r = await asyncio.to_thread(
+                gmx.run_gmx_command,
                 "editconf",
                 ["-f", _src, "-o", box_gro, "-c", "-d", str(box_clearance), "-bt", "cubic"],
                 work_dir=str(work_dir),
@@ -373,7 +410,8 @@ async def start_simulation(session_id: str):
         _archive_existing(work_dir, "md.tpr", "mdout.mdp")
         index_file = OmegaConf.select(cfg, "system.index") or None
         has_index = index_file and (work_dir / index_file).exists()
-        grompp = gmx.grompp(
+        grompp = await asyncio.to_thread(
+            gmx.grompp,
             mdp_file="md.mdp",
             topology_file=top_file,
             coordinate_file=coord_file,
@@ -394,13 +432,13 @@ async def start_simulation(session_id: str):
         output_prefix = f"{_SIM_SUBDIR}/md"
         # Ensure a fresh Docker-backed mdrun process per launch.
         try:
-            gmx._cleanup()
+            await asyncio.to_thread(gmx._cleanup)
         except Exception:
             pass
         gpu_id = OmegaConf.select(cfg, "gromacs.gpu_id") or None
         # Auto-detect an available GPU if none was explicitly configured
         if not gpu_id:
-            gpu_id = _auto_detect_gpu()
+            gpu_id = await asyncio.to_thread(_auto_detect_gpu)
         # Pass plumed.dat for enhanced-sampling methods
         method_name = OmegaConf.select(cfg, "method._target_name") or "md"
         plumed_methods = {
@@ -424,6 +462,7 @@ async def start_simulation(session_id: str):
             plumed_file=plumed_file,
             extra_flags=["-cpt", "0.1"],  # checkpoint every ~6s so pause/resume works
         )
+        watch_mdrun(session, gmx._mdrun_proc)
         expected_nsteps = OmegaConf.select(cfg, "method.nsteps")
         session.sim_status = {
             "status": "running",
@@ -451,8 +490,6 @@ async def start_simulation(session_id: str):
 @router.get("/sessions/{session_id}/simulate/status")
 async def simulation_status(session_id: str):
     """Check whether mdrun is currently running for this session."""
-    from web.backend.session_manager import get_simulation_status
-
     result = get_simulation_status(session_id)
     terminal = result.get("status") if result.get("status") in {"finished", "failed"} else None
     if terminal:
@@ -469,8 +506,6 @@ async def stop_simulation(session_id: str):
     After SIGTERM GROMACS should flush a checkpoint file.  We verify it exists
     so the user knows whether resume is possible.
     """
-    from web.backend.session_manager import stop_session_simulation
-
     stopped = stop_session_simulation(session_id)
     session = get_session(session_id)
     has_checkpoint = False
@@ -485,8 +520,6 @@ async def stop_simulation(session_id: str):
 @router.post("/sessions/{session_id}/simulate/terminate")
 async def terminate_simulation(session_id: str):
     """Permanently stop a simulation — reset to standby, discard checkpoint intent."""
-    from web.backend.session_manager import stop_session_simulation
-
     stop_session_simulation(session_id)
     session = get_session(session_id)
     if session:
@@ -516,7 +549,12 @@ async def resume_simulation(session_id: str):
     session = get_session(session_id)
     if not session:
         raise HTTPException(404, "Session not found")
+    async with session.lock:
+        _ensure_not_running(session_id)
+        return await _resume_simulation(session)
+
 
+async def _resume_simulation(session: Session) -> dict:
     work_dir = Path(session.work_dir)
     cfg = session.agent.cfg
     gmx = session.agent._gmx
@@ -540,13 +578,13 @@ async def resume_simulation(session_id: str):
     try:
         # Clean up any stale process handle
         try:
-            gmx._cleanup()
+            await asyncio.to_thread(gmx._cleanup)
         except Exception:
             pass
 
         gpu_id = OmegaConf.select(cfg, "gromacs.gpu_id") or None
         if not gpu_id:
-            gpu_id = _auto_detect_gpu()
+            gpu_id = await asyncio.to_thread(_auto_detect_gpu)
 
         # Generate plumed.dat if needed (same as initial launch)
         method_name = OmegaConf.select(cfg, "method._target_name") or "plain_md"
@@ -571,6 +609,7 @@ async def resume_simulation(session_id: str):
             plumed_file=plumed_file,
             extra_flags=["-cpt", "1"],
         )
+        watch_mdrun(session, gmx._mdrun_proc)
 
         expected_nsteps = OmegaConf.select(cfg, "method.nsteps")
         session.sim_status = {
@@ -8,18 +8,23 @@ Evicted sessions can be transparently restored from disk via restore_session().
 from __future__ import annotations
 
 import asyncio
+import copy
 import os
+import subprocess
+import threading
 import uuid
 from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from importlib.util import find_spec
 from pathlib import Path
 
 from md_agent.utils.parsers import parse_gromacs_log_progress
 
 
+@lru_cache(maxsize=1)
 def _repo_conf_dir() -> str:
-    """Return the conf/ directory, whether running from the repo or installed."""
+    """Return the conf/ directory, whether running from the repo or installed (cached)."""
     spec = find_spec("md_agent")
     if spec and spec.origin:
         pkg_dir = Path(spec.origin).parent
@@ -37,17 +42,27 @@ def _repo_conf_dir() -> str:
 
 
 def _load_hydra_cfg(overrides: list[str], work_dir: str):
+    """Compose the Hydra config for a session rooted at *work_dir*.
+
+    The composed tree is cached per override list; each session gets its own
+    deep copy with ``run.work_dir`` filled in.
+    """
+    from omegaconf import OmegaConf
+
+    cfg = copy.deepcopy(_compose_cfg(tuple(overrides)))
+    OmegaConf.update(cfg, "run.work_dir", work_dir)
+    return cfg
+
+
+@lru_cache(maxsize=32)
+def _compose_cfg(overrides: tuple[str, ...]):
     from hydra import compose, initialize_config_dir
     from hydra.core.global_hydra import GlobalHydra
 
     conf_dir = _repo_conf_dir()
     GlobalHydra.instance().clear()
     with initialize_config_dir(config_dir=conf_dir, job_name="amd-web"):
-        cfg = compose(
-            config_name="config",
-            overrides=overrides + [f"run.work_dir={work_dir}"],
-        )
-    return cfg
+        return compose(config_name="config", overrides=list(overrides))
 
 
 @dataclass
@@ -60,10 +75,38 @@ class Session:
     sim_status: dict = field(default_factory=dict)
     # agent is set after __init__ to allow dataclass + post-init pattern
     agent: object = field(default=None, init=False)
+    # mdrun Popen reaped by a watcher thread (see watch_mdrun)
+    watched_proc: object = field(default=None, init=False)
 
 
 _MAX_SESSIONS = int(os.getenv("AMD_MAX_SESSIONS", "50"))
 _sessions: OrderedDict[str, Session] = OrderedDict()
+# Guards every mutation of _sessions (handlers run on several threadpool
+# workers) and snapshots taken for iteration. Plain reads use dict.get().
+_sessions_lock = threading.Lock()
+
+
+def watch_mdrun(session: Session, proc: subprocess.Popen) -> None:
+    """Reap *proc* in a daemon thread as soon as it exits.
+
+    ``Popen.wait()`` sets ``returncode`` on exit, so status checks for a
+    watched process read an attribute instead of polling ``waitpid``. A
+    dedicated thread is used because the wait lasts as long as the run and
+    would otherwise pin a worker of the shared ``asyncio.to_thread`` pool.
+    """
+    session.watched_proc = proc
+    threading.Thread(
+        target=proc.wait,
+        name=f"mdrun-watch-{session.session_id[:8]}",
+        daemon=True,
+    ).start()
+
+
+def _returncode(session: Session, proc: subprocess.Popen) -> int | None:
+    """Exit code of *proc*, or None while it is still running."""
+    if proc is session.watched_proc:
+        return proc.returncode  # kept current by the watch_mdrun thread
+    return proc.poll()
 
 
 def _has_active_simulation(session: Session) -> bool:
@@ -72,7 +115,7 @@ def _has_active_simulation(session: Session) -> bool:
         runner = getattr(session.agent, "_gmx", None)
         if runner is not None:
             proc = getattr(runner, "_mdrun_proc", None)
-            if proc is not None and proc.poll() is None:
+            if proc is not None and _returncode(session, proc) is None:
                 return True
     except Exception:
         pass
@@ -80,7 +123,10 @@ def _has_active_simulation(session: Session) -> bool:
 
 
 def _evict_if_needed() -> None:
-    """Remove the oldest idle session if we're over the limit."""
+    """Remove the oldest idle session if we're over the limit.
+
+    Caller must hold ``_sessions_lock``.
+    """
     while len(_sessions) > _MAX_SESSIONS:
         # Find the oldest session that doesn't have an active simulation
         evict_key = None
@@ -90,13 +136,24 @@ def _evict_if_needed() -> None:
                 break
         if evict_key is None:
             break  # All sessions have active simulations — can't evict
-        _sessions.pop(evict_key)
+        _release(_sessions.pop(evict_key))
+
+
+def _release(session: Session) -> None:
+    """Remove the session's warm GROMACS container, if any (non-blocking)."""
+    try:
+        runner = getattr(session.agent, "_gmx", None)
+        if runner is not None:
+            runner.close()
+    except Exception:
+        pass
 
 
 def _touch(session_id: str) -> None:
     """Move a session to the end (most recently used)."""
-    if session_id in _sessions:
-        _sessions.move_to_end(session_id)
+    with _sessions_lock:
+        if session_id in _sessions:
+            _sessions.move_to_end(session_id)
 
 
 def create_session(
@@ -123,8 +180,9 @@ def create_session(
     sid = str(uuid.uuid4())
     session = Session(session_id=sid, work_dir=work_dir, nickname=nickname, username=username)
     session.agent = MDAgent(cfg=cfg, work_dir=work_dir)
-    _sessions[sid] = session
-    _evict_if_needed()
+    with _sessions_lock:
+        _sessions[sid] = session
+        _evict_if_needed()
     return session
 
 
@@ -136,7 +194,8 @@ def get_session(session_id: str) -> Session | None:
 
 
 def list_sessions(username: str = "") -> list[dict]:
-    sessions = _sessions.values()
+    with _sessions_lock:
+        sessions = list(_sessions.values())
     if username:
         sessions = [s for s in sessions if s.username == username]
     return [
@@ -154,7 +213,7 @@ def stop_session_simulation(session_id: str) -> bool:
         runner = getattr(session.agent, "_gmx", None)
         if runner is not None:
             proc = getattr(runner, "_mdrun_proc", None)
-            if proc is not None and proc.poll() is None:
+            if proc is not None and _returncode(session, proc) is None:
                 runner._cleanup()
                 return True
     except Exception:
@@ -335,7 +394,7 @@ def get_simulation_status(session_id: str) -> dict:
                 return _with_timestamps(status)
             if proc is None:
                 return _with_timestamps({"running": False, "status": "standby"})
-            rc = proc.poll()
+            rc = _returncode(session, proc)
             if rc is None:
                 return _with_timestamps({"running": True, "status": "running", "pid": proc.pid})
             try:
@@ -364,9 +423,10 @@ def restore_session(
     username: str = "",
 ) -> Session:
     """Return existing in-memory session, or reconstruct it from session-root config.yaml."""
-    if session_id in _sessions:
+    session = _sessions.get(session_id)
+    if session is not None:
         _touch(session_id)
-        return _sessions[session_id]
+        return session
 
     from md_agent.agent import MDAgent
 
@@ -400,13 +460,19 @@ def restore_session(
         session_id=session_id, work_dir=work_dir, nickname=nickname, username=username
     )
     session.agent = MDAgent(cfg=cfg, work_dir=work_dir)
-    _sessions[session_id] = session
-    _evict_if_needed()
+    with _sessions_lock:
+        _sessions[session_id] = session
+        _evict_if_needed()
     return session
 
 
 def delete_session(session_id: str) -> bool:
-    return _sessions.pop(session_id, None) is not None
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is None:
+        return False
+    _release(session)
+    return True
 
 
 def get_or_restore_session(session_id: str) -> Session | None:
@@ -415,6 +481,23 @@ def get_or_restore_session(session_id: str) -> Session | None:
     if session:
         return session
 
+    # Fast path: the SQLite session index (kept in sync by session_store) maps
+    # the id straight to its work dir, so a worker restart does not cost a
+    # walk of every outputs/**/session.json.
+    try:
+        from web.backend.db import get_session_indexed
+
+        row = get_session_indexed(session_id)
+        if row and row["status"] != "deleted" and Path(row["work_dir"]).is_dir():
+            return restore_session(
+                session_id=session_id,
+                work_dir=row["work_dir"],
+                nickname=row["nickname"],
+                username=row["username"],
+            )
+    except Exception:
+        pass  # no index yet, or a stale entry: fall back to scanning
+
     repo_outputs = Path(__file__).parents[3] / "outputs"
     scan_roots = [Path("outputs"), repo_outputs]
     seen: set[Path] = set()